@@ -18,6 +18,8 @@ import seaborn as sns
 import statsmodels.api as sm
 from scipy import stats
 
+from src.data_processing.file_io import read_table
+
 # Set style
 sns.set_style('whitegrid')
 plt.rcParams['figure.dpi'] = 100
@@ -151,7 +153,7 @@ def main():
 
     # Load data
     print("\n### Loading Data ###")
-    df = pd.read_csv('data/final/analysis_dataset.csv')
+    df = read_table('data/final/analysis_dataset.csv')
     print(f"Loaded {len(df)} companies")
 
     # Create output directory
@@ -12,8 +12,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import pandas as pd
-
+from src.data_processing.file_io import read_table
 from src.visualization.plots import create_all_plots
 
 
@@ -28,7 +27,7 @@ def main():
     analysis_file = "data/final/analysis_dataset.csv"
 
     try:
-        df = pd.read_csv(analysis_file)
+        df = read_table(analysis_file)
         print(f"[OK] Loaded {len(df)} companies from {analysis_file}")
     except FileNotFoundError:
         print(f"[ERROR] File not found: {analysis_file}")
@@ -142,7 +142,7 @@ def main():
     if master_df is not None:
         print("\nMaster Dataset Statistics:")
         print(f"\tTotal records: {len(master_df):,}")
-        print(f"\tUnique companies: {master_df['Ticker'].nunique()}")
+        print(f"\tUnique companies: {master_df['Ticker'].cat.categories.size}")
         print(
             f"\tDate range: {master_df['Date'].min().date()} to {master_df['Date'].max().date()}"
         )
@@ -195,8 +195,8 @@ def main():
         print("\tdata/processed/returns.csv")
         print("\tdata/processed/market_returns.csv")
         if results["risk_free"]:
-            print("\tdata/processed/risk_free_rate.csv")
-        print("\tdata/final/master_dataset.csv")
+            print("\tdata/processed/risk_free_rate.parquet")
+        print("\tdata/final/master_dataset.parquet")
 
         print("\nNext steps:")
         print("\tpython scripts/run_feature_engineering.py")
@@ -22,6 +22,7 @@ sys.path.insert(0, str(project_root))
 
 import pandas as pd
 
+from src.data_processing.file_io import read_table
 from src.analysis.diagnostics import run_diagnostics
 from src.analysis.regression_models import (
     run_rq1_sharpe_esg,
@@ -43,7 +44,7 @@ def main():
     analysis_file = "data/final/analysis_dataset.csv"
 
     try:
-        df = pd.read_csv(analysis_file)
+        df = read_table(analysis_file)
         print(f"[OK] Loaded {len(df)} companies from {analysis_file}")
         print(f"\nColumns: {len(df.columns)}")
         print(f"Sample: {df.columns.tolist()[:10]}...")
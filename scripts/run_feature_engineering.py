@@ -18,10 +18,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import pandas as pd
-
+from src.data_processing.file_io import read_table, resolve_table, table_columns
 from src.feature_engineering.aggregate_features import aggregate_all_features
 from src.feature_engineering.controls import create_control_variables
+from src.feature_engineering.group_stats import ticker_return_stats
 from src.feature_engineering.performance_metrics import calculate_performance_metrics
 from src.feature_engineering.risk_metrics import calculate_risk_metrics
 
@@ -38,9 +38,28 @@ def main():
     print("\n### Loading Master Dataset ###")
     master_file = "data/final/master_dataset.csv"
 
+    # Only the columns the feature steps use are loaded; the ESG columns are
+    # read separately by the aggregation step
+    feature_columns = [
+        "Ticker",
+        "Date",
+        "Return",
+        "Excess_Return",
+        "Market_Return",
+        "Market_Cap",
+        "Sector",
+    ]
+
     try:
-        master_df = pd.read_csv(master_file)
-        print(f"[OK] Loaded {len(master_df)} records from {master_file}")
+        master_columns = set(table_columns(master_file))
+        master_df = read_table(
+            master_file,
+            columns=[col for col in feature_columns if col in master_columns],
+        )
+        # Parquet already stores tickers as a dictionary; CSV input is
+        # converted so every feature table shares the same categories
+        master_df["Ticker"] = master_df["Ticker"].astype("category")
+        print(f"[OK] Loaded {len(master_df)} records from {resolve_table(master_file)}")
         print(f"\tTickers: {master_df['Ticker'].nunique()}")
         print(f"\tDate range: {master_df['Date'].min()} to {master_df['Date'].max()}")
     except FileNotFoundError:
@@ -48,14 +67,29 @@ def main():
         print("Please run data processing first: python scripts/process_data.py")
         return False
 
+    # Performance and risk metrics are both derived from one pass of
+    # per-ticker statistics over the daily returns
+    market_return_col = "Market_Return" if "Market_Return" in master_df else None
+    if market_return_col and master_df[market_return_col].isna().all():
+        market_return_col = None
+
     # Step 1: Calculate performance metrics
     print("\n\n### STEP 1/4: Performance Metrics ###")
     try:
+        return_stats = ticker_return_stats(
+            master_df,
+            ticker_col="Ticker",
+            return_col="Return",
+            excess_return_col="Excess_Return",
+            market_return_col=market_return_col,
+        )
+
         performance_df = calculate_performance_metrics(
             df=master_df,
             ticker_col="Ticker",
             return_col="Return",
             excess_return_col="Excess_Return",
+            stats=return_stats,
         )
 
         # Save intermediate results
@@ -79,6 +113,7 @@ def main():
             return_col="Return",
             excess_return_col="Excess_Return",
             market_return_col="Market_Return",
+            stats=return_stats,
         )
 
         # Save intermediate results
@@ -122,13 +157,14 @@ def main():
 
     # Step 4: Aggregate all features
     print("\n\n### STEP 4/4: Aggregate All Features ###")
+    analysis_file = "data/final/analysis_dataset.csv"
     try:
         analysis_df = aggregate_all_features(
             master_file=master_file,
             performance_df=performance_df,
             risk_df=risk_df,
             controls_df=controls_df,
-            output_file="data/final/analysis_dataset.csv",
+            output_file=analysis_file,
         )
 
     except Exception as e:
@@ -149,7 +185,10 @@ def main():
     print("\tdata/processed/performance_metrics.csv")
     print("\tdata/processed/risk_metrics.csv")
     print("\tdata/processed/control_variables.csv")
-    print("\tdata/final/analysis_dataset.csv")
+    print(f"\t{analysis_file}")
+    parquet_file = resolve_table(analysis_file)
+    if parquet_file.suffix == ".parquet":
+        print(f"\t{parquet_file}")
 
     print("\nFinal analysis dataset:")
     print(f"\tCompanies: {len(analysis_df)}")
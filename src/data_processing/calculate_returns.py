@@ -2,16 +2,18 @@
 Calculate daily returns from stock prices.
 """
 
-from pathlib import Path
-
 import numpy as np
 import pandas as pd
 
+from src.data_processing.file_io import find_column, read_table, write_table
+
 
 def calculate_returns(
     input_file: str = "data/processed/prices_cleaned.csv",
     output_file: str = "data/processed/returns.csv",
     return_type: str = "simple",
+    fast_io: bool = False,
+    verbose: bool = True,
 ) -> pd.DataFrame:
     """
     Calculate daily returns from price data.
@@ -20,6 +22,8 @@ def calculate_returns(
         input_file: Path to cleaned price data
         output_file: Path to save returns data
         return_type: Type of returns ('simple' or 'log')
+        fast_io: Save as compressed Parquet instead of CSV
+        verbose: Print return statistics, preview and summary
 
     Returns:
         DataFrame with returns
@@ -31,7 +35,7 @@ def calculate_returns(
     # Load data
     print(f"\n[LOADING] Loading data from: {input_file}")
     try:
-        df = pd.read_csv(input_file)
+        df = read_table(input_file)
         print(f"[OK] Loaded {len(df)} records")
     except FileNotFoundError:
         print(f"[ERROR] File not found: {input_file}")
@@ -39,23 +43,11 @@ def calculate_returns(
         return None
 
     # Identify columns
-    date_col = None
-    for col in ["Date", "date", "DATE"]:
-        if col in df.columns:
-            date_col = col
-            break
-
-    ticker_col = None
-    for col in ["Ticker", "Symbol", "ticker", "symbol"]:
-        if col in df.columns:
-            ticker_col = col
-            break
-
-    price_col = None
-    for col in ["Close", "Adj Close", "close", "adj_close", "Price"]:
-        if col in df.columns:
-            price_col = col
-            break
+    date_col = find_column(df.columns, ["Date", "date", "DATE"])
+    ticker_col = find_column(df.columns, ["Ticker", "Symbol", "ticker", "symbol"])
+    price_col = find_column(
+        df.columns, ["Close", "Adj Close", "close", "adj_close", "Price"]
+    )
 
     if not all([date_col, ticker_col, price_col]):
         print("\n[ERROR] Could not identify required columns")
@@ -97,37 +89,41 @@ def calculate_returns(
 
     # Check for infinite values
     print("\n[CHECKING] Checking for problematic returns...")
-    inf_count = np.isinf(df["Return"]).sum()
+    inf_mask = np.isinf(df["Return"])
+    inf_count = inf_mask.sum()
     if inf_count > 0:
         print(f"\tFound {inf_count} infinite values, removing")
-        df = df[~np.isinf(df["Return"])]
+        df = df[~inf_mask]
+
+    # Save returns data
+    saved_file = write_table(df, output_file, fast_io=fast_io)
+    print(f"\n[OK] Returns data saved to: {saved_file}")
+
+    if not verbose:
+        return df
+
+    # Return statistics (one describe() pass feeds every figure below)
+    return_stats = df["Return"].describe()
 
     # Flag extreme returns (> 100% or < -100% for simple returns)
     if return_type == "simple":
-        extreme_mask = (df["Return"] > 1.0) | (df["Return"] < -1.0)
-        extreme_count = extreme_mask.sum()
+        extreme_count = ((df["Return"] > 1.0) | (df["Return"] < -1.0)).sum()
         if extreme_count > 0:
             print(f"\tFound {extreme_count} extreme returns (>100% or <-100%)")
-            print(f"\tMax return: {df['Return'].max():.2%}")
-            print(f"\tMin return: {df['Return'].min():.2%}")
+            print(f"\tMax return: {return_stats['max']:.2%}")
+            print(f"\tMin return: {return_stats['min']:.2%}")
             print("\tThese may indicate stock splits or data errors")
 
-    # Return statistics
     print("\n[STATS] Return Statistics:")
-    print(f"\tMean daily return: {df['Return'].mean():.4%}")
-    print(f"\tMedian daily return: {df['Return'].median():.4%}")
-    print(f"\tStd dev: {df['Return'].std():.4%}")
-    print(f"\tMin: {df['Return'].min():.2%}")
-    print(f"\tMax: {df['Return'].max():.2%}")
+    print(f"\tMean daily return: {return_stats['mean']:.4%}")
+    print(f"\tMedian daily return: {return_stats['50%']:.4%}")
+    print(f"\tStd dev: {return_stats['std']:.4%}")
+    print(f"\tMin: {return_stats['min']:.2%}")
+    print(f"\tMax: {return_stats['max']:.2%}")
 
     # Check return distribution
     print("\n[STATS] Return Distribution:")
-    print(df["Return"].describe())
-
-    # Save returns data
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_file, index=False)
-    print(f"\n[OK] Returns data saved to: {output_file}")
+    print(return_stats)
 
     # Display sample
     print("\nData preview:")
@@ -148,6 +144,7 @@ def calculate_returns(
 def calculate_market_returns(
     input_file: str = "data/raw/sp500_index.csv",
     output_file: str = "data/processed/market_returns.csv",
+    fast_io: bool = False,
 ) -> pd.DataFrame:
     """
     Calculate daily returns for market index (S&P 500).
@@ -155,6 +152,7 @@ def calculate_market_returns(
     Args:
         input_file: Path to S&P 500 index data
         output_file: Path to save market returns
+        fast_io: Save as compressed Parquet instead of CSV
 
     Returns:
         DataFrame with market returns
@@ -206,8 +204,10 @@ def calculate_market_returns(
     # Save
     df = df.reset_index()
     df = df.rename(columns={"Date": "Date"})
-    df[["Date", "Market_Return"]].to_csv(output_file, index=False)
-    print(f"\n[OK] Market returns saved to: {output_file}")
+    saved_file = write_table(
+        df[["Date", "Market_Return"]], output_file, fast_io=fast_io
+    )
+    print(f"\n[OK] Market returns saved to: {saved_file}")
 
     return df
 
@@ -2,15 +2,17 @@
 Clean and validate ESG data.
 """
 
-from pathlib import Path
-
 import numpy as np
 import pandas as pd
 
+from src.data_processing.file_io import find_column, write_table
+
 
 def clean_esg_data(
     input_file: str = "data/raw/sp500_esg_data.csv",
     output_file: str = "data/processed/esg_cleaned.csv",
+    fast_io: bool = False,
+    verbose: bool = True,
 ) -> pd.DataFrame:
     """
     Clean and validate ESG scores data.
@@ -25,6 +27,8 @@ def clean_esg_data(
     Args:
         input_file: Path to raw ESG data
         output_file: Path to save cleaned data
+        fast_io: Save as compressed Parquet instead of CSV
+        verbose: Print per-column diagnostics, summary and preview
 
     Returns:
         Cleaned DataFrame
@@ -43,19 +47,17 @@ def clean_esg_data(
         print("Please run data download script first.")
         return None
 
-    print(f"\nColumns: {df.columns.tolist()}")
+    columns = df.columns.tolist()
+    if verbose:
+        print(f"\nColumns: {columns}")
 
     # Identify column names (handle different naming conventions)
     # Try to find ticker column
     ticker_candidates = ["Ticker", "Symbol", "ticker", "symbol", "TICKER", "SYMBOL"]
-    ticker_col = None
-    for col in ticker_candidates:
-        if col in df.columns:
-            ticker_col = col
-            break
+    ticker_col = find_column(columns, ticker_candidates)
 
     if ticker_col is None:
-        print(f"\n[ERROR] Could not find ticker column in: {df.columns.tolist()}")
+        print(f"\n[ERROR] Could not find ticker column in: {columns}")
         return None
 
     print(f"\n[OK] Using '{ticker_col}' as ticker column")
@@ -68,14 +70,15 @@ def clean_esg_data(
     # Remove duplicates by ticker
     print("[PROCESSING] Removing duplicate tickers...")
     duplicates = df[ticker_col].duplicated()
-    if duplicates.sum() > 0:
-        print(f"\tFound {duplicates.sum()} duplicate tickers")
+    duplicate_count = duplicates.sum()
+    if duplicate_count > 0:
+        print(f"\tFound {duplicate_count} duplicate tickers")
         print("\tKeeping first occurrence")
         df = df[~duplicates].copy()
 
     # Identify ESG score columns
     esg_columns = []
-    for col in df.columns:
+    for col in columns:
         col_lower = col.lower()
         if (
             "esg" in col_lower
@@ -94,15 +97,16 @@ def clean_esg_data(
 
     # Check for missing values
     print("\n[CHECKING] Checking for missing values...")
-    missing_counts = df[esg_columns].isnull().sum()
+    missing_mask = df[esg_columns].isnull()
     total_rows = len(df)
 
-    for col, missing in missing_counts.items():
-        pct = (missing / total_rows) * 100
-        print(f"\t{col}: {missing} ({pct:.1f}%)")
+    if verbose:
+        for col, missing in missing_mask.sum().items():
+            pct = (missing / total_rows) * 100
+            print(f"\t{col}: {missing} ({pct:.1f}%)")
 
     # Handle missing values based on percentage
-    total_missing = df[esg_columns].isnull().any(axis=1).sum()
+    total_missing = missing_mask.any(axis=1).sum()
     missing_pct = (total_missing / total_rows) * 100
 
     print(
@@ -115,11 +119,9 @@ def clean_esg_data(
     else:
         print("\tStrategy: Imputing with median by sector (>= 5% threshold)")
         # Find sector column
-        sector_col = None
-        for col in ["Sector", "sector", "SECTOR", "Industry", "industry"]:
-            if col in df.columns:
-                sector_col = col
-                break
+        sector_col = find_column(
+            columns, ["Sector", "sector", "SECTOR", "Industry", "industry"]
+        )
 
         if sector_col:
             print(f"\tUsing '{sector_col}' for sector-based imputation")
@@ -133,24 +135,38 @@ def clean_esg_data(
                 df[esg_col] = df[esg_col].fillna(df[esg_col].median())
 
     # Validate ESG score ranges
-    print("\n[CHECKING] Validating ESG score ranges...")
-    for col in esg_columns:
-        min_val = df[col].min()
-        max_val = df[col].max()
-        print(f"\t{col}: {min_val:.2f} - {max_val:.2f}")
-
-        # Flag suspicious values (typical range is 0-100)
-        if min_val < 0 or max_val > 100:
-            print(f"\t[WARNING] Warning: {col} has values outside typical 0-100 range")
-
-    # Check for infinite values
-    inf_check = np.isinf(df[esg_columns]).sum()
-    if inf_check.sum() > 0:
+    if verbose:
+        print("\n[CHECKING] Validating ESG score ranges...")
+        min_vals = df[esg_columns].min()
+        max_vals = df[esg_columns].max()
+        for col in esg_columns:
+            min_val = min_vals[col]
+            max_val = max_vals[col]
+            print(f"\t{col}: {min_val:.2f} - {max_val:.2f}")
+
+            # Flag suspicious values (typical range is 0-100)
+            if min_val < 0 or max_val > 100:
+                print(
+                    f"\t[WARNING] Warning: {col} has values outside typical 0-100 range"
+                )
+
+    # Check for infinite values (single pass over the ESG block)
+    esg_values = df[esg_columns].to_numpy(dtype=float)
+    inf_mask = np.isinf(esg_values)
+    if inf_mask.any():
+        inf_check = pd.Series(inf_mask.sum(axis=0), index=esg_columns)
         print("\n[WARNING] Found infinite values:")
         print(inf_check[inf_check > 0])
-        df = df.replace([np.inf, -np.inf], np.nan)
+        df[esg_columns] = np.where(inf_mask, np.nan, esg_values)
         df = df.dropna(subset=esg_columns)
 
+    # Save cleaned data
+    saved_file = write_table(df, output_file, fast_io=fast_io)
+    print(f"\n[OK] Cleaned data saved to: {saved_file}")
+
+    if not verbose:
+        return df
+
     # Final statistics
     print("\n" + "=" * 60)
     print("CLEANING SUMMARY")
@@ -161,11 +177,6 @@ def clean_esg_data(
         f"Records removed: {original_count - len(df)} ({((original_count - len(df)) / original_count * 100):.1f}%)"
     )
 
-    # Save cleaned data
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_file, index=False)
-    print(f"\n[OK] Cleaned data saved to: {output_file}")
-
     # Display sample
     print("\nData preview:")
     display_cols = [ticker_col] + esg_columns[:5]  # Show ticker + first 5 ESG columns
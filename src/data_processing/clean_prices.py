@@ -3,16 +3,67 @@ Clean and process stock price data.
 """
 
 from pathlib import Path
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.data_processing.file_io import find_column, write_table
+
+# Raw files larger than this are read in chunks, keeping only rows inside the
+# analysis window, so peak memory scales with the window instead of the file
+CHUNKED_READ_THRESHOLD_MB = 100
+CHUNK_SIZE = 200_000
+
+
+def read_price_window(
+    input_file: str,
+    date_col: str,
+    start_date: str,
+    end_date: str,
+    chunksize: int = CHUNK_SIZE,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Read a price CSV chunk by chunk, keeping only rows inside the date window.
+
+    Args:
+        input_file: Path to raw price data
+        date_col: Name of the date column
+        start_date: Start of analysis window
+        end_date: End of analysis window
+        chunksize: Number of rows per chunk
+
+    Returns:
+        Tuple of (filtered DataFrame, total rows read)
+    """
+    chunks = []
+    total_rows = 0
+    empty_window = None
+    for chunk in pd.read_csv(input_file, chunksize=chunksize):
+        total_rows += len(chunk)
+        chunk[date_col] = pd.to_datetime(chunk[date_col])
+        chunk = chunk[(chunk[date_col] >= start_date) & (chunk[date_col] <= end_date)]
+        if len(chunk) > 0:
+            chunks.append(chunk)
+        elif empty_window is None:
+            # Keep a filtered-out chunk so an empty result has parsed dtypes
+            empty_window = chunk
+
+    if not chunks:
+        if empty_window is None:
+            empty_window = pd.read_csv(input_file, nrows=0)
+            empty_window[date_col] = pd.to_datetime(empty_window[date_col])
+        return empty_window.reset_index(drop=True), total_rows
+
+    return pd.concat(chunks, ignore_index=True), total_rows
+
 
 def clean_price_data(
     input_file: str = "data/raw/sp500_price_data.csv",
     output_file: str = "data/processed/prices_cleaned.csv",
     start_date: str = "2023-09-01",
     end_date: str = "2024-08-31",
+    fast_io: bool = False,
 ) -> pd.DataFrame:
     """
     Clean and process stock price data.
@@ -29,6 +80,7 @@ def clean_price_data(
         output_file: Path to save cleaned data
         start_date: Start of analysis window
         end_date: End of analysis window
+        fast_io: Save as compressed Parquet instead of CSV
 
     Returns:
         Cleaned DataFrame
@@ -37,39 +89,50 @@ def clean_price_data(
     print("Cleaning Price Data")
     print("=" * 60)
 
-    # Load data
+    # Load header first so large files can be filtered while reading
     print(f"\n[LOADING] Loading data from: {input_file}")
     try:
-        df = pd.read_csv(input_file)
-        print(f"[OK] Loaded {len(df)} records")
+        columns = pd.read_csv(input_file, nrows=0).columns.tolist()
     except FileNotFoundError:
         print(f"[ERROR] File not found: {input_file}")
         print("Please run data download script first.")
         return None
 
-    print(f"\nColumns: {df.columns.tolist()}")
+    print(f"\nColumns: {columns}")
 
     # Identify date column
     date_candidates = ["Date", "date", "DATE", "Timestamp", "timestamp"]
-    date_col = None
-    for col in date_candidates:
-        if col in df.columns:
-            date_col = col
-            break
+    date_col = find_column(columns, date_candidates)
 
     if date_col is None:
-        print(f"\n[ERROR] Could not find date column in: {df.columns.tolist()}")
+        print(f"\n[ERROR] Could not find date column in: {columns}")
         return None
 
-    # Parse dates
-    print(f"\n[PROCESSING] Parsing dates from column: '{date_col}'")
-    df[date_col] = pd.to_datetime(df[date_col])
+    file_size_mb = Path(input_file).stat().st_size / (1024 * 1024)
+    if file_size_mb > CHUNKED_READ_THRESHOLD_MB:
+        # Parse and filter each chunk so rows outside the window are never held
+        print(
+            f"\n[PROCESSING] Reading {file_size_mb:.0f} MB file in chunks of {CHUNK_SIZE} rows"
+        )
+        print(f"[PROCESSING] Filtering to date range: {start_date} to {end_date}")
+        df, original_count = read_price_window(
+            input_file, date_col, start_date, end_date
+        )
+        print(f"[OK] Loaded {original_count} records")
+        print(f"\tKept {len(df)} / {original_count} records")
+    else:
+        df = pd.read_csv(input_file)
+        print(f"[OK] Loaded {len(df)} records")
+
+        # Parse dates
+        print(f"\n[PROCESSING] Parsing dates from column: '{date_col}'")
+        df[date_col] = pd.to_datetime(df[date_col])
 
-    # Filter to analysis window
-    print(f"[PROCESSING] Filtering to date range: {start_date} to {end_date}")
-    original_count = len(df)
-    df = df[(df[date_col] >= start_date) & (df[date_col] <= end_date)].copy()
-    print(f"\tKept {len(df)} / {original_count} records")
+        # Filter to analysis window
+        print(f"[PROCESSING] Filtering to date range: {start_date} to {end_date}")
+        original_count = len(df)
+        df = df[(df[date_col] >= start_date) & (df[date_col] <= end_date)].copy()
+        print(f"\tKept {len(df)} / {original_count} records")
 
     # Sort by date
     print("[PROCESSING] Sorting by date...")
@@ -195,9 +258,8 @@ def clean_price_data(
     print(f"Total records: {len(df)}")
 
     # Save cleaned data
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_file, index=False)
-    print(f"\n[OK] Cleaned data saved to: {output_file}")
+    saved_file = write_table(df, output_file, fast_io=fast_io)
+    print(f"\n[OK] Cleaned data saved to: {saved_file}")
 
     # Display sample
     print("\nData preview:")
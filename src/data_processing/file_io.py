@@ -0,0 +1,137 @@
+"""
+Read and write pipeline tables as CSV or Parquet.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+# Rows converted to Arrow and written per Parquet row group
+ROW_GROUP_SIZE = 200_000
+
+
+def find_column(columns: List[str], candidates: List[str]) -> Optional[str]:
+    """
+    Return the first candidate name present in columns.
+
+    Args:
+        columns: Available column names
+        candidates: Names to look for, in order of preference
+
+    Returns:
+        Matching column name, or None if no candidate is present
+    """
+    column_set = set(columns)
+    return next((col for col in candidates if col in column_set), None)
+
+
+def write_table(
+    df: pd.DataFrame,
+    output_file: str,
+    fast_io: bool = False,
+) -> Path:
+    """
+    Save a DataFrame as CSV, or as compressed Parquet when fast_io is set.
+
+    Parquet is written next to the requested path with a '.parquet' suffix,
+    one row group at a time so only a slice of the frame is ever held as
+    Arrow data. If pyarrow is not installed, falls back to CSV.
+
+    Args:
+        df: DataFrame to save
+        output_file: Target path (its suffix is replaced for Parquet output)
+        fast_io: Write zstd-compressed Parquet instead of CSV
+
+    Returns:
+        Path of the file that was written
+    """
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fast_io or output_path.suffix == ".parquet":
+        parquet_path = output_path.with_suffix(".parquet")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            with pq.ParquetWriter(parquet_path, schema, compression="zstd") as writer:
+                for start in range(0, len(df), ROW_GROUP_SIZE):
+                    chunk = df.iloc[start : start + ROW_GROUP_SIZE]
+                    writer.write_table(
+                        pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    )
+            return parquet_path
+        except ImportError:
+            print("[WARNING] pyarrow not installed, writing CSV instead")
+            print("Install it with: pip install pyarrow")
+            output_path = output_path.with_suffix(".csv")
+
+    df.to_csv(output_path, index=False)
+    return output_path
+
+
+def resolve_table(input_file: str) -> Path:
+    """
+    Pick the file to load for a table path.
+
+    A '.parquet' sibling of a '.csv' path is preferred when it exists and is
+    at least as recent as the CSV, so stale Parquet files are never used.
+
+    Args:
+        input_file: Path to a '.csv' or '.parquet' file
+
+    Returns:
+        Path of the file to read
+    """
+    input_path = Path(input_file)
+    if input_path.suffix == ".parquet":
+        return input_path
+
+    parquet_path = input_path.with_suffix(".parquet")
+    if parquet_path.exists() and (
+        not input_path.exists()
+        or parquet_path.stat().st_mtime >= input_path.stat().st_mtime
+    ):
+        return parquet_path
+
+    return input_path
+
+
+def table_columns(input_file: str) -> List[str]:
+    """
+    List the columns of a table without loading its rows.
+
+    Args:
+        input_file: Path to a '.csv' or '.parquet' file
+
+    Returns:
+        Column names
+    """
+    input_path = resolve_table(input_file)
+    if input_path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(input_path).names
+
+    return pd.read_csv(input_path, nrows=0).columns.tolist()
+
+
+def read_table(input_file: str, columns: List[str] = None, **kwargs) -> pd.DataFrame:
+    """
+    Load a table saved by write_table, preferring a fresh Parquet sibling.
+
+    Args:
+        input_file: Path to a '.csv' or '.parquet' file
+        columns: Only load these columns (None loads all)
+        **kwargs: Extra arguments passed to pd.read_csv
+
+    Returns:
+        Loaded DataFrame
+    """
+    input_path = resolve_table(input_file)
+    if input_path.suffix == ".parquet":
+        return pd.read_parquet(input_path, engine="pyarrow", columns=columns)
+
+    return pd.read_csv(input_path, usecols=columns, **kwargs)
@@ -0,0 +1,42 @@
+"""
+Fill gaps in dense float arrays (rates, index returns).
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """
+    Carry the last valid value forward over NaN gaps.
+
+    Uses bottleneck's C push kernel when available, pandas otherwise.
+
+    Args:
+        values: 1-D float array
+
+    Returns:
+        New float64 array with gaps filled (leading NaNs are kept)
+    """
+    filled = np.array(values, dtype=np.float64)
+    if bn is not None:
+        return bn.push(filled)
+    return pd.Series(filled).ffill().to_numpy()
+
+
+def backward_fill(values: np.ndarray) -> np.ndarray:
+    """
+    Carry the next valid value backward over NaN gaps.
+
+    Args:
+        values: 1-D float array
+
+    Returns:
+        New float64 array with gaps filled (trailing NaNs are kept)
+    """
+    return forward_fill(np.asarray(values)[::-1])[::-1]
@@ -2,11 +2,96 @@
 Merge all datasets into master analysis file.
 """
 
-from pathlib import Path
-
 import numpy as np
 import pandas as pd
 
+from src.data_processing.file_io import find_column, read_table, write_table
+from src.data_processing.gap_fill import backward_fill
+
+
+def inf_row_mask(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Flag rows holding an infinite value in any of the given columns.
+
+    Columns are OR-ed into one boolean array, so no (rows x columns) mask
+    is ever materialized.
+
+    Args:
+        df: DataFrame to scan
+        columns: Numeric columns to check
+
+    Returns:
+        Boolean array, True for rows with an infinite value
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        # Nullable (Float64/Int64) columns are read with NA as NaN
+        values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        np.logical_or(mask, np.isinf(values), out=mask)
+    return mask
+
+
+def values_by_row(values_by_date: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+    """
+    Look up a per-date array for every row through the rows' date codes.
+
+    Args:
+        values_by_date: One value per trading date
+        date_codes: Date code of each row (-1 for rows without a date)
+
+    Returns:
+        Array with one value per row (NaN for rows without a date)
+    """
+    # Code -1 picks the NaN appended after the last trading date
+    return np.append(values_by_date, np.nan)[date_codes]
+
+
+def read_date_series(input_file: str, value_col: str, date_dtype) -> pd.DataFrame:
+    """
+    Load a date-level series (risk-free rate, market return).
+
+    Args:
+        input_file: Path to a table with 'Date' and value_col columns
+        value_col: Name of the value column
+        date_dtype: Date dtype of the frame the series will be merged into
+
+    Returns:
+        DataFrame with 'Date' and value_col columns
+    """
+    df = read_table(
+        input_file,
+        columns=["Date", value_col],
+        parse_dates=["Date"],
+        dtype={value_col: "float64"},
+    )
+    df["Date"] = pd.to_datetime(df["Date"], utc=True).astype(date_dtype)
+    return df
+
+
+def carry_forward_by_date(
+    date_df: pd.DataFrame, value_col: str, trading_dates: pd.Index
+) -> tuple:
+    """
+    Align a one-row-per-date series to the trading dates, carrying the last
+    known value forward over dates that have none.
+
+    Args:
+        date_df: DataFrame with 'Date' and value_col columns
+        value_col: Name of the value column
+        trading_dates: Sorted unique trading dates
+
+    Returns:
+        Tuple of (array with one value per trading date, NaN before the first
+        value; boolean array, True for trading dates with no value of their
+        own)
+    """
+    date_df = date_df.dropna(subset=[value_col]).sort_values("Date")
+    aligned = pd.merge_asof(
+        pd.DataFrame({"Date": trading_dates}), date_df, on="Date", direction="backward"
+    )
+    unmatched = ~trading_dates.isin(date_df["Date"])
+    return aligned[value_col].to_numpy(), unmatched
+
 
 def merge_all_data(
     esg_file: str = "data/processed/esg_cleaned.csv",
@@ -15,6 +100,7 @@ def merge_all_data(
     risk_free_file: str = "data/processed/risk_free_rate.csv",
     company_info_file: str = "data/raw/company_info.csv",
     output_file: str = "data/final/master_dataset.csv",
+    fast_io: bool = True,
 ) -> pd.DataFrame:
     """
     Merge all datasets into a single master file.
@@ -34,6 +120,7 @@ def merge_all_data(
         risk_free_file: Path to risk-free rate data
         company_info_file: Path to company information
         output_file: Path to save master dataset
+        fast_io: Save as compressed Parquet (set False to write CSV)
 
     Returns:
         Merged DataFrame
@@ -45,7 +132,12 @@ def merge_all_data(
     # Step 1: Load returns data (base dataset)
     print("\n[LOADING] Step 1: Loading returns data...")
     try:
-        returns_df = pd.read_csv(returns_file)
+        returns_df = read_table(
+            returns_file,
+            columns=["Date", "Ticker", "Return"],
+            parse_dates=["Date"],
+            dtype={"Return": "float64"},
+        )
         returns_df["Date"] = pd.to_datetime(returns_df["Date"], utc=True)
         print(f"[OK] Loaded {len(returns_df)} records")
         print(f"\tTickers: {returns_df['Ticker'].nunique()}")
@@ -59,20 +151,31 @@ def merge_all_data(
     # Step 2: Load and merge ESG data
     print("\n[LOADING] Step 2: Loading and merging ESG data...")
     try:
-        esg_df = pd.read_csv(esg_file)
+        esg_df = read_table(esg_file)
 
         # Find ticker column in ESG data
-        ticker_col_esg = None
-        for col in ["Ticker", "Symbol", "ticker", "symbol"]:
-            if col in esg_df.columns:
-                ticker_col_esg = col
-                break
+        ticker_col_esg = find_column(
+            esg_df.columns, ["Ticker", "Symbol", "ticker", "symbol"]
+        )
 
         if ticker_col_esg:
             esg_df = esg_df.rename(columns={ticker_col_esg: "Ticker"})
 
         print(f"[OK] Loaded {len(esg_df)} companies")
 
+        # Share one categorical dtype so ticker merges compare integer codes
+        all_tickers = pd.Index(returns_df["Ticker"].unique()).union(
+            pd.Index(esg_df["Ticker"].unique())
+        )
+        ticker_dtype = pd.CategoricalDtype(all_tickers)
+        returns_df["Ticker"] = returns_df["Ticker"].astype(ticker_dtype)
+        esg_df["Ticker"] = esg_df["Ticker"].astype(ticker_dtype)
+
+        # Sort the narrow returns frame once by ticker and date; the inner
+        # merge keeps the left row order, so the wide merged frame comes out
+        # sorted without a second pass
+        returns_df = returns_df.sort_values(["Ticker", "Date"])
+
         # Merge
         master_df = returns_df.merge(esg_df, on="Ticker", how="inner")
         print(
@@ -85,79 +188,129 @@ def merge_all_data(
             print(f"\tESG tickers sample: {esg_df['Ticker'].head().tolist()}")
             return None
 
+        # The inputs are fully merged in; release them before the next steps
+        del returns_df, esg_df
+
     except FileNotFoundError:
         print(f"[ERROR] File not found: {esg_file}")
         return None
 
+    # The date-level values below are looked up per row through the date
+    # codes, so the frame is never re-sorted
+    date_codes, trading_dates = pd.factorize(master_df["Date"], sort=True)
+
+    # Rows with a missing date get code -1; they match no date-level value
+    no_date = date_codes < 0
+    missing_dates = no_date.sum()
+    if missing_dates > 0:
+        print(f"\n[WARNING]  Missing date for {missing_dates} records")
+
+    # Rows per trading date; missing counts for the date-level columns are
+    # read off these instead of scanning the per-row values
+    rows_per_date = np.bincount(date_codes[~no_date], minlength=len(trading_dates))
+
     # Step 3: Load and merge risk-free rate
     print("\n[LOADING] Step 3: Loading and merging risk-free rate...")
     try:
-        rf_df = pd.read_csv(risk_free_file)
-        rf_df["Date"] = pd.to_datetime(rf_df["Date"], utc=True)
+        rf_df = read_date_series(
+            risk_free_file, "Daily_RF_Rate", master_df["Date"].dtype
+        )
         print(f"[OK] Loaded {len(rf_df)} dates")
 
-        # Merge
-        master_df = master_df.merge(
-            rf_df[["Date", "Daily_RF_Rate"]], on="Date", how="left"
+        # Merge (the last known rate is carried forward per trading date)
+        rf_by_date, rf_unmatched = carry_forward_by_date(
+            rf_df, "Daily_RF_Rate", trading_dates
         )
-        print(f"\tAfter merge: {len(master_df)} records")
 
-        # Check for missing risk-free rates
-        missing_rf = master_df["Daily_RF_Rate"].isnull().sum()
+        # Rows whose date has no rate of its own were filled from the last
+        # known rate; dates before the first rate are back-filled
+        missing_rf = rows_per_date[rf_unmatched].sum() + missing_dates
         if missing_rf > 0:
             print(f"\t[WARNING]  Missing risk-free rate for {missing_rf} records")
             print("\tForward-filling missing values...")
-            master_df = master_df.sort_values("Date")
-            master_df["Daily_RF_Rate"] = master_df["Daily_RF_Rate"].ffill().bfill()
+            rf_by_date = backward_fill(rf_by_date)
+
+        rf_values = values_by_row(rf_by_date, date_codes)
+        master_df["Daily_RF_Rate"] = rf_values
+
+        # Excess return is computed while the rate array is at hand; the
+        # column is attached in Step 6 to keep the output column order
+        excess_return = master_df["Return"].to_numpy() - rf_values
+        print(f"\tAfter merge: {len(master_df)} records")
 
     except FileNotFoundError:
         print(f"[WARNING]  File not found: {risk_free_file}")
         print("\tSetting risk-free rate to 0")
+        rf_by_date = np.zeros(len(trading_dates))
         master_df["Daily_RF_Rate"] = 0.0
+        excess_return = master_df["Return"].to_numpy(copy=True)
 
     # Step 4: Load and merge market returns
     print("\n[LOADING] Step 4: Loading and merging market returns...")
     try:
-        market_df = pd.read_csv(market_returns_file)
-        market_df["Date"] = pd.to_datetime(market_df["Date"], utc=True)
+        market_df = read_date_series(
+            market_returns_file, "Market_Return", master_df["Date"].dtype
+        )
         print(f"[OK] Loaded {len(market_df)} dates")
 
-        # Merge
-        master_df = master_df.merge(
-            market_df[["Date", "Market_Return"]], on="Date", how="left"
+        # Merge (the last known return is carried forward per trading date)
+        mkt_by_date, mkt_unmatched = carry_forward_by_date(
+            market_df, "Market_Return", trading_dates
         )
-        print(f"\tAfter merge: {len(master_df)} records")
 
-        # Check for missing market returns
-        missing_mkt = master_df["Market_Return"].isnull().sum()
+        # Rows whose date has no return of its own were filled from the last
+        # known return; dates before the first return are back-filled
+        missing_mkt = rows_per_date[mkt_unmatched].sum() + missing_dates
         if missing_mkt > 0:
             print(f"\t[WARNING]  Missing market return for {missing_mkt} records")
             print("\tForward-filling missing values...")
-            master_df = master_df.sort_values("Date")
-            master_df["Market_Return"] = master_df["Market_Return"].ffill().bfill()
+            mkt_by_date = backward_fill(mkt_by_date)
+
+        master_df["Market_Return"] = values_by_row(mkt_by_date, date_codes)
+        print(f"\tAfter merge: {len(master_df)} records")
 
     except FileNotFoundError:
         print(f"[WARNING]  File not found: {market_returns_file}")
         print("\tProceeding without market returns (will affect beta calculation)")
+        mkt_by_date = np.full(len(trading_dates), np.nan)
         master_df["Market_Return"] = np.nan
 
     # Step 5: Load and merge company info (market cap, sector)
     print("\n[LOADING] Step 5: Loading and merging company information...")
     try:
-        company_df = pd.read_csv(company_info_file)
+        company_columns = ["Ticker", "Market_Cap", "Sector", "Industry"]
+        company_df = read_table(
+            company_info_file,
+            columns=company_columns,
+            dtype={"Market_Cap": "float64"},
+        )
+        # A CSV read keeps the file's column order; restore the requested one
+        # so the merged columns come out in the same order as before
+        company_df = company_df[company_columns].astype(
+            {"Ticker": ticker_dtype, "Sector": "category", "Industry": "category"}
+        )
         print(f"[OK] Loaded {len(company_df)} companies")
 
+        # One row per ticker, so the merge cannot add ticker-date duplicates
+        # and rows stay aligned with the date codes
+        company_rows = len(company_df)
+        company_df = company_df.drop_duplicates(subset=["Ticker"], keep="first")
+        dropped_companies = company_rows - len(company_df)
+        if dropped_companies > 0:
+            print(
+                f"\t[WARNING]  Found {dropped_companies} duplicate company rows, "
+                "keeping the first per ticker..."
+            )
+
         # Merge
-        master_df = master_df.merge(
-            company_df[["Ticker", "Market_Cap", "Sector", "Industry"]],
-            on="Ticker",
-            how="left",
-        )
+        master_df = master_df.merge(company_df, on="Ticker", how="left")
+        del company_df
         print(f"\tAfter merge: {len(master_df)} records")
 
         # Check for missing values
-        missing_mcap = master_df["Market_Cap"].isnull().sum()
-        missing_sector = master_df["Sector"].isnull().sum()
+        missing_counts = master_df[["Market_Cap", "Sector"]].isna().sum()
+        missing_mcap = missing_counts["Market_Cap"]
+        missing_sector = missing_counts["Sector"]
 
         if missing_mcap > 0:
             print(f"\t[WARNING]  Missing market cap for {missing_mcap} records")
@@ -174,56 +327,86 @@ def merge_all_data(
 
     # Step 6: Calculate excess returns
     print("\n[PROCESSING] Calculating excess returns...")
-    master_df["Excess_Return"] = master_df["Return"] - master_df["Daily_RF_Rate"]
+    master_df["Excess_Return"] = excess_return
 
     # Step 7: Final validation and cleanup
     print("\n[CHECKING] Final validation...")
 
-    # Check for duplicates
-    duplicates = master_df.duplicated(subset=["Ticker", "Date"]).sum()
+    # Check for duplicates (rows are sorted by ticker and date, so repeats
+    # are adjacent and can be found by comparing each row with the previous)
+    ticker_codes = master_df["Ticker"].cat.codes.to_numpy()
+    dup_mask = np.zeros(len(master_df), dtype=bool)
+    dup_mask[1:] = (ticker_codes[1:] == ticker_codes[:-1]) & (
+        date_codes[1:] == date_codes[:-1]
+    )
+    duplicates = dup_mask.sum()
     if duplicates > 0:
         print(f"\tFound {duplicates} duplicate ticker-date pairs, removing...")
-        master_df = master_df.drop_duplicates(subset=["Ticker", "Date"], keep="first")
 
     # Check for infinite values
-    numeric_cols = master_df.select_dtypes(include=[np.number]).columns
-    inf_mask = np.isinf(master_df[numeric_cols]).any(axis=1)
-    inf_count = inf_mask.sum()
+    key_cols = {"Date", "Ticker", "Sector", "Industry"}
+    numeric_cols = [
+        col
+        for col, dtype in master_df.dtypes.items()
+        if col not in key_cols
+        and pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+    ]
+    inf_mask = inf_row_mask(master_df, numeric_cols)
+    inf_count = (inf_mask & ~dup_mask).sum()
     if inf_count > 0:
         print(f"\tFound {inf_count} rows with infinite values, removing...")
-        master_df = master_df[~inf_mask]
 
-    # Sort by ticker and date
-    master_df = master_df.sort_values(["Ticker", "Date"]).reset_index(drop=True)
+    # Drop duplicate and infinite rows together (the index is a RangeIndex,
+    # so row positions double as labels)
+    drop_rows = np.flatnonzero(dup_mask | inf_mask)
+    if len(drop_rows) > 0:
+        master_df.drop(index=drop_rows, inplace=True)
+        master_df.reset_index(drop=True, inplace=True)
+        drop_codes = date_codes[drop_rows]
+        rows_per_date -= np.bincount(
+            drop_codes[drop_codes >= 0], minlength=len(trading_dates)
+        )
+
+    # Drop categories for tickers/sectors that did not survive the merges
+    for col in ["Ticker", "Sector", "Industry"]:
+        if isinstance(master_df[col].dtype, pd.CategoricalDtype):
+            master_df[col] = master_df[col].cat.remove_unused_categories()
 
     # Summary statistics
     print("\n" + "=" * 60)
     print("MERGE SUMMARY")
     print("=" * 60)
     print(f"Total records: {len(master_df)}")
-    print(f"Unique tickers: {master_df['Ticker'].nunique()}")
+    # Unused ticker categories were dropped above, so this count is O(1)
+    print(f"Unique tickers: {master_df['Ticker'].cat.categories.size}")
     print(
         f"Date range: {master_df['Date'].min().date()} to {master_df['Date'].max().date()}"
     )
-    print(f"Trading days: {master_df['Date'].nunique()}")
+    print(f"Trading days: {np.count_nonzero(rows_per_date)}")
+
+    # Rows with every ESG column present, AND-ed column by column
+    esg_complete = np.ones(len(master_df), dtype=bool)
+    for col in master_df.columns:
+        if "esg" in col.lower():
+            np.logical_and(
+                esg_complete, master_df[col].notna().to_numpy(), out=esg_complete
+            )
+
+    present = master_df[["Return", "Market_Cap"]].notna().sum()
+    present["Daily_RF_Rate"] = rows_per_date[~np.isnan(rf_by_date)].sum()
+    present["Market_Return"] = rows_per_date[~np.isnan(mkt_by_date)].sum()
 
     print("\nData completeness:")
-    print(f"\tReturns: {master_df['Return'].notna().sum()} / {len(master_df)}")
-    print(
-        f"\tESG scores: {master_df.filter(like='ESG').notna().all(axis=1).sum()} / {len(master_df)}"
-    )
-    print(
-        f"\tRisk-free rate: {master_df['Daily_RF_Rate'].notna().sum()} / {len(master_df)}"
-    )
-    print(
-        f"\tMarket returns: {master_df['Market_Return'].notna().sum()} / {len(master_df)}"
-    )
-    print(f"\tMarket cap: {master_df['Market_Cap'].notna().sum()} / {len(master_df)}")
+    print(f"\tReturns: {present['Return']} / {len(master_df)}")
+    print(f"\tESG scores: {esg_complete.sum()} / {len(master_df)}")
+    print(f"\tRisk-free rate: {present['Daily_RF_Rate']} / {len(master_df)}")
+    print(f"\tMarket returns: {present['Market_Return']} / {len(master_df)}")
+    print(f"\tMarket cap: {present['Market_Cap']} / {len(master_df)}")
 
     # Save master dataset
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    master_df.to_csv(output_file, index=False)
-    print(f"\n[OK] Master dataset saved to: {output_file}")
+    saved_file = write_table(master_df, output_file, fast_io=fast_io)
+    print(f"\n[OK] Master dataset saved to: {saved_file}")
 
     # Display sample
     print("\nData preview:")
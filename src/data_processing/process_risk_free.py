@@ -2,15 +2,23 @@
 Process risk-free rate data from FRED.
 """
 
-from pathlib import Path
-
+import numpy as np
 import pandas as pd
 
+from src.data_processing.file_io import (
+    find_column,
+    read_table,
+    table_columns,
+    write_table,
+)
+from src.data_processing.gap_fill import backward_fill, forward_fill
+
 
 def process_risk_free_rate(
     input_file: str = "data/raw/DGS3MO.csv",
     output_file: str = "data/processed/risk_free_rate.csv",
     trading_days_file: str = "data/processed/returns.csv",
+    fast_io: bool = True,
 ) -> pd.DataFrame:
     """
     Process risk-free rate data:
@@ -22,6 +30,7 @@ def process_risk_free_rate(
         input_file: Path to FRED DGS3MO data
         output_file: Path to save processed risk-free rate
         trading_days_file: Path to stock returns (to get trading days)
+        fast_io: Save as compressed Parquet (set False to write CSV)
 
     Returns:
         DataFrame with daily risk-free rates
@@ -30,38 +39,29 @@ def process_risk_free_rate(
     print("Processing Risk-Free Rate Data")
     print("=" * 60)
 
-    # Load FRED data
+    # Read the header first so dates can be parsed while loading
     print(f"\n[LOADING] Loading data from: {input_file}")
     try:
         # FRED data typically has 'DATE' and value column
-        df = pd.read_csv(input_file)
-        print(f"[OK] Loaded {len(df)} records")
+        columns = pd.read_csv(input_file, nrows=0).columns.tolist()
     except FileNotFoundError:
         print(f"[ERROR] File not found: {input_file}")
         print("Please run data download script first.")
         return None
 
-    print(f"\nColumns: {df.columns.tolist()}")
+    print(f"\nColumns: {columns}")
 
     # Identify date column
-    date_col = None
-    for col in ["DATE", "Date", "date"]:
-        if col in df.columns:
-            date_col = col
-            break
+    date_col = find_column(columns, ["DATE", "Date", "date"])
 
     # Identify rate column
-    rate_col = None
-    for col in ["DGS3MO", "VALUE", "Value", "value"]:
-        if col in df.columns:
-            rate_col = col
-            break
+    rate_col = find_column(columns, ["DGS3MO", "VALUE", "Value", "value"])
 
     if not date_col or not rate_col:
         # Try using first two columns
-        if len(df.columns) >= 2:
-            date_col = df.columns[0]
-            rate_col = df.columns[1]
+        if len(columns) >= 2:
+            date_col = columns[0]
+            rate_col = columns[1]
             print(f"[WARNING]  Guessing columns: {date_col} (date), {rate_col} (rate)")
         else:
             print("[ERROR] Could not identify date and rate columns")
@@ -71,45 +71,54 @@ def process_risk_free_rate(
     print(f"\tDate: {date_col}")
     print(f"\tRate: {rate_col}")
 
-    # Parse dates
+    # Parse dates in the reader; FRED marks missing values as '.'
+    df = pd.read_csv(
+        input_file,
+        usecols=[date_col, rate_col],
+        parse_dates=[date_col],
+        dtype={rate_col: "float64"},
+        na_values=["."],
+    )
+    print(f"[OK] Loaded {len(df)} records")
+
     df[date_col] = pd.to_datetime(df[date_col], utc=True)
     df = df.rename(columns={date_col: "Date", rate_col: "Annual_Rate"})
 
-    # Handle missing values (marked as '.' in FRED data sometimes)
-    if df["Annual_Rate"].dtype == object:
-        df["Annual_Rate"] = pd.to_numeric(df["Annual_Rate"], errors="coerce")
-
     # Drop NaN values
     print("\n[PROCESSING] Handling missing values...")
     missing_count = df["Annual_Rate"].isnull().sum()
     if missing_count > 0:
         print(f"\tFound {missing_count} missing values")
         print("\tForward-filling gaps...")
-        df["Annual_Rate"] = df["Annual_Rate"].ffill().bfill()
+        df["Annual_Rate"] = backward_fill(forward_fill(df["Annual_Rate"].to_numpy()))
 
     # Convert annual rate to daily rate
     # Formula: daily_rate = (1 + annual_rate/100) ^ (1/252) - 1
     print("\n[PROCESSING] Converting annual rate to daily rate...")
     print("\tAssuming 252 trading days per year")
 
-    df["Daily_RF_Rate"] = (1 + df["Annual_Rate"] / 100) ** (1 / 252) - 1
+    # Computed as expm1(log1p(r) / 252), which avoids a pow per row and keeps
+    # precision for small rates
+    annual_rate = df["Annual_Rate"].to_numpy(dtype=np.float64)
+    df["Daily_RF_Rate"] = np.expm1(np.log1p(annual_rate * 0.01) / 252.0)
 
     # Load trading days from stock data
     print(f"\n[LOADING] Loading trading days from: {trading_days_file}")
     try:
-        returns_df = pd.read_csv(trading_days_file)
-        date_col_returns = None
-        for col in ["Date", "date", "DATE"]:
-            if col in returns_df.columns:
-                date_col_returns = col
-                break
+        returns_columns = table_columns(trading_days_file)
+        date_col_returns = find_column(returns_columns, ["Date", "date", "DATE"])
 
         if date_col_returns:
-            returns_df[date_col_returns] = pd.to_datetime(
-                returns_df[date_col_returns], utc=True
+            # Only the date column is needed, so skip loading the rest
+            returns_df = read_table(
+                trading_days_file,
+                columns=[date_col_returns],
+                parse_dates=[date_col_returns],
+            )
+            trading_days = pd.DatetimeIndex(
+                pd.to_datetime(returns_df[date_col_returns], utc=True)
             )
-            trading_days = returns_df[date_col_returns].unique()
-            trading_days = pd.Series(trading_days).sort_values()
+            trading_days = trading_days.unique().sort_values()
             print(f"[OK] Found {len(trading_days)} unique trading days")
         else:
             print("[WARNING]  Could not find date column in returns data")
@@ -122,11 +131,13 @@ def process_risk_free_rate(
     if trading_days is not None:
         print("\n[PROCESSING] Aligning risk-free rate with trading days...")
         trading_df = pd.DataFrame({"Date": trading_days})
-        df = trading_df.merge(df, on="Date", how="left")
+        df["Date"] = df["Date"].astype(trading_days.dtype)
 
-        # Forward-fill for trading days that don't have FRED data
-        df["Daily_RF_Rate"] = df["Daily_RF_Rate"].ffill()
-        df["Annual_Rate"] = df["Annual_Rate"].ffill()
+        # Backward as-of merge carries the last FRED rate over trading days
+        # that have no FRED data
+        df = pd.merge_asof(
+            trading_df, df.sort_values("Date"), on="Date", direction="backward"
+        )
 
         print(f"\tAligned to {len(df)} trading days")
 
@@ -154,9 +165,10 @@ def process_risk_free_rate(
         df = df.dropna(subset=["Daily_RF_Rate"])
 
     # Save processed data
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    df[["Date", "Daily_RF_Rate", "Annual_Rate"]].to_csv(output_file, index=False)
-    print(f"\n[OK] Processed data saved to: {output_file}")
+    saved_file = write_table(
+        df[["Date", "Daily_RF_Rate", "Annual_Rate"]], output_file, fast_io=fast_io
+    )
+    print(f"\n[OK] Processed data saved to: {saved_file}")
 
     # Display sample
     print("\nData preview:")
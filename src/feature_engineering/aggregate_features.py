@@ -2,10 +2,29 @@
 Aggregate all features into a single firm-level dataset for regression analysis.
 """
 
-from pathlib import Path
+import re
 
 import pandas as pd
 
+from src.data_processing.file_io import (
+    read_table,
+    resolve_table,
+    table_columns,
+    write_table,
+)
+
+# Column name patterns (case-insensitive substring matches); the summary
+# counts ESG variables with the same pattern that selects the ESG columns
+ESG_COLUMN_PATTERN = re.compile(
+    "esg|environment|social|governance|score|rating", re.IGNORECASE
+)
+COLUMN_CATEGORY_PATTERNS = {
+    "ESG": ESG_COLUMN_PATTERN,
+    "Performance": re.compile("return|sharpe", re.IGNORECASE),
+    "Risk": re.compile("volatility|beta|deviation|drawdown|var", re.IGNORECASE),
+    "Control": re.compile("market_cap|sector", re.IGNORECASE),
+}
+
 
 def aggregate_all_features(
     master_file: str = "data/final/master_dataset.csv",
@@ -13,6 +32,7 @@ def aggregate_all_features(
     risk_df: pd.DataFrame = None,
     controls_df: pd.DataFrame = None,
     output_file: str = "data/final/analysis_dataset.csv",
+    fast_io: bool = True,
 ) -> pd.DataFrame:
     """
     Aggregate all features into a firm-level dataset.
@@ -29,6 +49,7 @@ def aggregate_all_features(
         risk_df: DataFrame with risk metrics
         controls_df: DataFrame with control variables
         output_file: Path to save final analysis dataset
+        fast_io: Also save a compressed Parquet copy next to the CSV
 
     Returns:
         DataFrame with one row per company and all features
@@ -37,53 +58,46 @@ def aggregate_all_features(
     print("Aggregating All Features")
     print("=" * 60)
 
-    # Load master dataset to get ESG scores
-    print(f"\n[LOADING] Loading master dataset from: {master_file}")
-    master_df = pd.read_csv(master_file)
+    # Read only the header first; the ESG columns are picked from it so
+    # the daily return columns are never loaded
+    print(f"\n[LOADING] Loading master dataset from: {resolve_table(master_file)}")
+    master_columns = table_columns(master_file)
 
     # Get one row per ticker with ESG scores
     print("\n[PROCESSING] Extracting ESG scores (one row per ticker)...")
 
     # Find ESG columns
-    esg_columns = [
-        col
-        for col in master_df.columns
-        if any(
-            keyword in col.lower()
-            for keyword in [
-                "esg",
-                "environment",
-                "social",
-                "governance",
-                "score",
-                "rating",
-            ]
-        )
-    ]
+    esg_columns = [col for col in master_columns if ESG_COLUMN_PATTERN.search(col)]
 
     # Also include Ticker and Company name if available
     base_columns = ["Ticker"]
-    if "Company_Name" in master_df.columns:
+    if "Company_Name" in master_columns:
         base_columns.append("Company_Name")
-    elif "Company" in master_df.columns:
+    elif "Company" in master_columns:
         base_columns.append("Company")
 
-    esg_df = (
-        master_df[base_columns + esg_columns].drop_duplicates(subset=["Ticker"]).copy()
-    )
+    # CSV readers return usecols in file order, so reorder explicitly
+    master_df = read_table(master_file, columns=base_columns + esg_columns)
+    esg_df = master_df[base_columns + esg_columns].drop_duplicates(subset=["Ticker"])
 
     print(f"\t[OK] ESG data: {len(esg_df)} companies")
     print(f"\tESG columns: {esg_columns}")
 
-    # Start with ESG data
-    analysis_df = esg_df.copy()
+    # Tickers are joined as a categorical column sharing the ESG categories,
+    # so each merge below compares integer codes instead of hashing strings
+    # (a CategoricalIndex join would fall back to a slow path instead)
+    esg_df["Ticker"] = esg_df["Ticker"].astype("category")
+    ticker_dtype = esg_df["Ticker"].dtype
+    analysis_df = esg_df
 
     # Merge performance metrics
     if performance_df is not None:
         print("\n[PROCESSING] Merging performance metrics...")
         print(f"\tPerformance data: {len(performance_df)} companies")
 
-        analysis_df = analysis_df.merge(performance_df, on="Ticker", how="inner")
+        analysis_df = analysis_df.merge(
+            performance_df.astype({"Ticker": ticker_dtype}), on="Ticker", how="inner"
+        )
         print(f"\tAfter merge: {len(analysis_df)} companies")
     else:
         print("\n[WARNING] No performance metrics provided")
@@ -93,7 +107,9 @@ def aggregate_all_features(
         print("\n[PROCESSING] Merging risk metrics...")
         print(f"\tRisk data: {len(risk_df)} companies")
 
-        analysis_df = analysis_df.merge(risk_df, on="Ticker", how="inner")
+        analysis_df = analysis_df.merge(
+            risk_df.astype({"Ticker": ticker_dtype}), on="Ticker", how="inner"
+        )
         print(f"\tAfter merge: {len(analysis_df)} companies")
     else:
         print("\n[WARNING] No risk metrics provided")
@@ -103,7 +119,9 @@ def aggregate_all_features(
         print("\n[PROCESSING] Merging control variables...")
         print(f"\tControls data: {len(controls_df)} companies")
 
-        analysis_df = analysis_df.merge(controls_df, on="Ticker", how="inner")
+        analysis_df = analysis_df.merge(
+            controls_df.astype({"Ticker": ticker_dtype}), on="Ticker", how="inner"
+        )
         print(f"\tAfter merge: {len(analysis_df)} companies")
     else:
         print("\n[WARNING] No control variables provided")
@@ -143,41 +161,19 @@ def aggregate_all_features(
     print("\nColumn categories:")
 
     # Count column types
-    esg_cols = [
-        col
-        for col in analysis_df.columns
-        if any(
-            k in col.lower() for k in ["esg", "environmental", "social", "governance"]
-        )
-    ]
-    perf_cols = [
-        col
-        for col in analysis_df.columns
-        if any(k in col.lower() for k in ["return", "sharpe"])
-    ]
-    risk_cols = [
-        col
-        for col in analysis_df.columns
-        if any(
-            k in col.lower()
-            for k in ["volatility", "beta", "deviation", "drawdown", "var"]
-        )
-    ]
-    control_cols = [
-        col
-        for col in analysis_df.columns
-        if any(k in col.lower() for k in ["market_cap", "sector"])
-    ]
-
-    print(f"\tESG variables: {len(esg_cols)}")
-    print(f"\tPerformance variables: {len(perf_cols)}")
-    print(f"\tRisk variables: {len(risk_cols)}")
-    print(f"\tControl variables: {len(control_cols)}")
+    for category, pattern in COLUMN_CATEGORY_PATTERNS.items():
+        count = sum(1 for col in analysis_df.columns if pattern.search(col))
+        print(f"\t{category} variables: {count}")
 
     # Save
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    analysis_df.to_csv(output_file, index=False)
-    print(f"\n[OK] Analysis dataset saved to: {output_file}")
+    # The CSV is the published deliverable read by the notebooks, so it is
+    # always written; the Parquet copy (written after it, so read_table
+    # sees it as fresh) is what the pipeline scripts load
+    saved_files = [write_table(analysis_df, output_file)]
+    if fast_io:
+        saved_files.append(write_table(analysis_df, output_file, fast_io=True))
+    for saved_file in saved_files:
+        print(f"\n[OK] Analysis dataset saved to: {saved_file}")
 
     # Display sample
     print("\nData preview:")
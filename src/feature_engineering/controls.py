@@ -35,12 +35,14 @@ def create_control_variables(
     # Ensure one row per ticker
     if df[ticker_col].duplicated().any():
         print("\n[PROCESSING] Multiple rows per ticker detected, keeping first...")
-        df = df.drop_duplicates(subset=[ticker_col], keep="first").copy()
+        df = df.drop_duplicates(subset=[ticker_col], keep="first")
 
     print("\n[INFO] Input data:")
     print(f"\tCompanies: {len(df)}")
 
-    results = df[[ticker_col]].copy()
+    # Output columns are collected as arrays and the results frame is built
+    # from them once at the end, rather than grown column by column
+    columns = {ticker_col: df[ticker_col].array}
 
     # 1. Log Market Cap
     print("\n[PROCESSING] Creating log market cap...")
@@ -57,31 +59,45 @@ def create_control_variables(
             print(f"\t[WARNING]  Zero market cap for {zero_mcap} companies")
 
         # Calculate log market cap (in billions for interpretability)
-        results["Market_Cap_Billions"] = df[market_cap_col] / 1e9
-        results["Log_Market_Cap"] = np.log(results["Market_Cap_Billions"])
-
-        # Replace inf/-inf with NaN
-        results["Log_Market_Cap"] = results["Log_Market_Cap"].replace(
-            [np.inf, -np.inf], np.nan
+        market_cap_billions = df[market_cap_col].to_numpy(dtype=np.float64) / 1e9
+        # The log is only taken where it is finite; zero, negative, missing
+        # and infinite market caps are left as NaN without producing inf
+        valid = np.isfinite(market_cap_billions) & (market_cap_billions > 0)
+        log_market_cap = np.log(
+            market_cap_billions,
+            out=np.full_like(market_cap_billions, np.nan),
+            where=valid,
         )
 
-        # Summary
-        valid_log_mcap = results["Log_Market_Cap"].notna().sum()
-        print(f"\t[OK] Created log market cap for {valid_log_mcap} companies")
-
-        print("\n   Market Cap Distribution:")
-        print(f"\t   Mean: ${results['Market_Cap_Billions'].mean():.2f}B")
-        print(f"\t   Median: ${results['Market_Cap_Billions'].median():.2f}B")
-        print(f"\t   Min: ${results['Market_Cap_Billions'].min():.2f}B")
-        print(f"\t   Max: ${results['Market_Cap_Billions'].max():.2f}B")
+        # Summary (from the float64 values, before downcasting)
+        market_cap = pd.Series(market_cap_billions).agg(
+            ["mean", "median", "min", "max"]
+        )
+        log_market_cap = pd.Series(log_market_cap)
+        log_summary = log_market_cap.agg(["count", "mean", "std"])
+        print(
+            "\n".join(
+                [
+                    f"\t[OK] Created log market cap for {log_summary['count']:.0f} companies",
+                    "\n   Market Cap Distribution:",
+                    f"\t   Mean: ${market_cap['mean']:.2f}B",
+                    f"\t   Median: ${market_cap['median']:.2f}B",
+                    f"\t   Min: ${market_cap['min']:.2f}B",
+                    f"\t   Max: ${market_cap['max']:.2f}B",
+                    "\n   Log Market Cap Distribution:",
+                    f"\t   Mean: {log_summary['mean']:.4f}",
+                    f"\t   Std: {log_summary['std']:.4f}",
+                ]
+            )
+        )
 
-        print("\n   Log Market Cap Distribution:")
-        print(f"\t   Mean: {results['Log_Market_Cap'].mean():.4f}")
-        print(f"\t   Std: {results['Log_Market_Cap'].std():.4f}")
+        # Market cap needs no more than float32 precision downstream
+        columns["Market_Cap_Billions"] = market_cap_billions.astype(np.float32)
+        columns["Log_Market_Cap"] = log_market_cap.to_numpy(dtype=np.float32)
     else:
         print(f"\t[WARNING]  Market cap column '{market_cap_col}' not found")
-        results["Market_Cap_Billions"] = np.nan
-        results["Log_Market_Cap"] = np.nan
+        columns["Market_Cap_Billions"] = np.full(len(df), np.nan, dtype=np.float32)
+        columns["Log_Market_Cap"] = np.full(len(df), np.nan, dtype=np.float32)
 
     # 2. Sector Dummies
     print("\n[PROCESSING] Creating sector dummy variables...")
@@ -94,21 +110,34 @@ def create_control_variables(
         for sector, count in sector_counts.items():
             print(f"\t   {sector}: {count}")
 
-        # Create dummy variables (drop_first=True to avoid multicollinearity)
-        sector_dummies = pd.get_dummies(
-            df[sector_col], prefix="Sector", drop_first=True, dtype=int
+        # Create dummy variables (drop first to avoid multicollinearity)
+        # Sectors are encoded as integer codes in sorted order, as
+        # pd.get_dummies does; code 0 is the baseline and missing is -1
+        sectors = df[sector_col]
+        if isinstance(sectors.dtype, pd.CategoricalDtype):
+            codes = sectors.cat.codes.to_numpy()
+            categories = sectors.cat.categories
+        else:
+            codes, categories = pd.factorize(sectors, sort=True)
+
+        # Column-major, so each dummy column below is a contiguous view
+        dummy_matrix = np.zeros(
+            (len(codes), max(len(categories) - 1, 0)), dtype=np.uint8, order="F"
         )
+        rows = np.flatnonzero(codes > 0)
+        dummy_matrix[rows, codes[rows] - 1] = 1
+        for i, sector in enumerate(categories[1:]):
+            columns[f"Sector_{sector}"] = dummy_matrix[:, i]
 
         print(
-            f"\n   [OK] Created {len(sector_dummies.columns)} sector dummies (dropped first as baseline)"
+            f"\n   [OK] Created {dummy_matrix.shape[1]} sector dummies (dropped first as baseline)"
         )
 
-        # Merge with results
-        results = pd.concat([results, sector_dummies], axis=1)
-
     else:
         print(f"\t[WARNING]  Sector column '{sector_col}' not found")
 
+    results = pd.DataFrame(columns, index=df.index, copy=False)
+
     # Summary
     print("\n" + "=" * 60)
     print("CONTROL VARIABLES SUMMARY")
@@ -0,0 +1,367 @@
+"""
+Per-ticker return statistics shared by the performance and risk metrics.
+
+For large datasets, when numba is installed, the statistics are computed
+by one compiled pass over each ticker's rows, with tickers spread across
+threads; otherwise grouped pandas aggregations are used.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import config, get_num_threads, njit, prange, set_num_threads
+except ImportError:
+    njit = None
+
+STAT_COLUMNS = [
+    "Trading_Days",
+    "Mean_Return",
+    "Return_Std",
+    "Mean_Excess_Return",
+    "Excess_Return_Std",
+    "Growth",
+    "Max_Drawdown",
+    "Beta",
+    "Negative_Days",
+    "Downside_Std",
+    "VaR_5pct",
+]
+
+# Quantile of daily returns reported as Value at Risk
+VAR_QUANTILE = 0.05
+
+# Minimum paired stock/market observations for a beta estimate
+MIN_BETA_OBSERVATIONS = 100
+
+# Rows below which the pandas aggregations are used even with numba. The
+# first call in a process compiles the kernel (~20s) or, once cached in
+# __pycache__, loads it (~0.4s); pandas takes ~0.06s for the ~106k-row
+# shipped dataset and only falls behind the cached kernel near 1.5M rows
+NUMBA_MIN_ROWS = 2_000_000
+
+
+def group_stats_kernel(returns, excess, market, offsets, min_pairs, var_quantile):
+    """
+    Compute the STAT_COLUMNS statistics for contiguous groups of rows.
+
+    Means and variances use Welford updates, beta uses the matching
+    co-moment update, and the drawdown tracks the running peak of the
+    cumulative growth, all in a single pass per group. The non-missing
+    returns are copied into a buffer along the way, and VaR is read from
+    it with a partial sort. NaN values are skipped per statistic, as
+    pandas does.
+
+    Args:
+        returns: Daily returns, grouped contiguously
+        excess: Daily excess returns, same order
+        market: Daily market returns, same order (all NaN to skip beta)
+        offsets: Group boundaries (group g spans offsets[g]:offsets[g + 1])
+        min_pairs: Minimum paired observations for beta
+        var_quantile: Quantile of returns reported as VaR
+
+    Returns:
+        Array of shape (n_groups, len(STAT_COLUMNS))
+    """
+    n_groups = len(offsets) - 1
+    out = np.full((n_groups, 11), np.nan)
+
+    for g in prange(n_groups):
+        start = offsets[g]
+        stop = offsets[g + 1]
+
+        n_ret = 0
+        mean_ret = 0.0
+        m2_ret = 0.0
+        n_exc = 0
+        mean_exc = 0.0
+        m2_exc = 0.0
+        n_pair = 0
+        mean_x = 0.0
+        mean_y = 0.0
+        co_xy = 0.0
+        m2_y = 0.0
+        growth = 1.0
+        peak = np.nan
+        max_drawdown = np.nan
+        n_neg = 0
+        mean_neg = 0.0
+        m2_neg = 0.0
+        buffer = np.empty(stop - start)
+
+        for i in range(start, stop):
+            r = returns[i]
+            if not np.isnan(r):
+                buffer[n_ret] = r
+                n_ret += 1
+                delta = r - mean_ret
+                mean_ret += delta / n_ret
+                m2_ret += delta * (r - mean_ret)
+
+                if r < 0:
+                    n_neg += 1
+                    delta = r - mean_neg
+                    mean_neg += delta / n_neg
+                    m2_neg += delta * (r - mean_neg)
+
+                growth *= 1.0 + r
+                if np.isnan(peak) or growth > peak:
+                    peak = growth
+                drawdown = (growth - peak) / peak
+                if np.isnan(max_drawdown) or drawdown < max_drawdown:
+                    max_drawdown = drawdown
+
+                m = market[i]
+                if not np.isnan(m):
+                    n_pair += 1
+                    dx = r - mean_x
+                    mean_x += dx / n_pair
+                    dy = m - mean_y
+                    mean_y += dy / n_pair
+                    co_xy += dx * (m - mean_y)
+                    m2_y += dy * (m - mean_y)
+
+            e = excess[i]
+            if not np.isnan(e):
+                n_exc += 1
+                delta = e - mean_exc
+                mean_exc += delta / n_exc
+                m2_exc += delta * (e - mean_exc)
+
+        out[g, 0] = stop - start
+        if n_ret > 0:
+            out[g, 1] = mean_ret
+        if n_ret > 1:
+            out[g, 2] = np.sqrt(m2_ret / (n_ret - 1))
+        if n_exc > 0:
+            out[g, 3] = mean_exc
+        if n_exc > 1:
+            out[g, 4] = np.sqrt(m2_exc / (n_exc - 1))
+        out[g, 5] = growth
+        out[g, 6] = max_drawdown
+        if n_pair >= min_pairs and m2_y > 0:
+            out[g, 7] = co_xy / m2_y
+        out[g, 8] = n_neg
+        if n_neg > 1:
+            out[g, 9] = np.sqrt(m2_neg / (n_neg - 1))
+
+        # Linear interpolation between the two order statistics around
+        # the quantile position, as pandas' quantile does
+        if n_ret > 0:
+            position = var_quantile * (n_ret - 1)
+            lower = int(np.floor(position))
+            values = np.partition(buffer[:n_ret], lower)
+            var_value = values[lower]
+            if lower + 1 < n_ret:
+                upper_value = values[lower + 1 :].min()
+                var_value += (position - lower) * (upper_value - var_value)
+            out[g, 10] = var_value
+
+    return out
+
+
+if njit is not None:
+    group_stats_kernel = njit(parallel=True, cache=True)(group_stats_kernel)
+
+
+def pandas_group_stats(
+    df: pd.DataFrame,
+    ticker_col: str,
+    return_col: str,
+    excess_return_col: str,
+    market_return_col: str = None,
+) -> pd.DataFrame:
+    """
+    Compute the STAT_COLUMNS statistics with grouped pandas aggregations.
+
+    Args:
+        df: DataFrame with daily returns
+        ticker_col: Name of ticker column
+        return_col: Name of return column
+        excess_return_col: Name of excess return column
+        market_return_col: Name of market return column (None skips beta)
+
+    Returns:
+        DataFrame indexed by ticker with STAT_COLUMNS
+    """
+    tickers = df[ticker_col]
+    grouped = df.groupby(ticker_col, sort=False, observed=True)
+
+    stats = pd.DataFrame(
+        {
+            "Trading_Days": grouped.size(),
+            "Mean_Return": grouped[return_col].mean(),
+            "Return_Std": grouped[return_col].std(),
+            "Mean_Excess_Return": grouped[excess_return_col].mean(),
+            "Excess_Return_Std": grouped[excess_return_col].std(),
+        }
+    )
+
+    # Growth and drawdown share one cumulative-growth path: its last value
+    # is the product of (1 + return), and the drawdown is measured against
+    # its running peak; both are then reduced in one grouped aggregation
+    growth = (1 + df[return_col]).groupby(tickers, sort=False, observed=True).cumprod()
+    running_max = growth.groupby(tickers, sort=False, observed=True).cummax()
+    path = pd.DataFrame({"Growth": growth, "Max_Drawdown": growth / running_max - 1})
+    path_stats = path.groupby(tickers, sort=False, observed=True).agg(
+        {"Growth": "last", "Max_Drawdown": "min"}
+    )
+
+    # A ticker without any return has an empty product
+    stats["Growth"] = path_stats["Growth"].fillna(1.0)
+    stats["Max_Drawdown"] = path_stats["Max_Drawdown"]
+
+    if market_return_col is None:
+        stats["Beta"] = np.nan
+    else:
+        stats["Beta"] = pandas_beta(df, tickers, return_col, market_return_col)
+
+    negative_returns = df[return_col].where(df[return_col] < 0)
+    negative_grouped = negative_returns.groupby(tickers, sort=False, observed=True)
+    stats["Negative_Days"] = negative_grouped.count()
+    stats["Downside_Std"] = negative_grouped.std()
+    stats["VaR_5pct"] = grouped[return_col].quantile(VAR_QUANTILE)
+    return stats
+
+
+def pandas_beta(
+    df: pd.DataFrame, tickers: pd.Series, return_col: str, market_return_col: str
+) -> pd.Series:
+    """
+    Compute per-ticker beta with a two-pass covariance on NumPy arrays.
+
+    Group means come from weighted bincounts over the ticker codes; the
+    deviation cross-products and squared market deviations are then
+    summed the same way, so only the two needed moments are formed.
+
+    Args:
+        df: DataFrame with daily returns
+        tickers: Ticker of each row
+        return_col: Name of return column
+        market_return_col: Name of market return column
+
+    Returns:
+        Series of betas indexed by ticker
+    """
+    codes, uniques = pd.factorize(tickers, sort=False)
+    n_groups = len(uniques)
+    stock = df[return_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    market = df[market_return_col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Beta = Cov(stock_return, market_return) / Var(market_return), over
+    # rows where both returns are present
+    valid = (codes >= 0) & ~np.isnan(stock) & ~np.isnan(market)
+    codes = codes[valid]
+    stock = stock[valid]
+    market = market[valid]
+
+    n_valid = np.bincount(codes, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stock_mean = np.bincount(codes, weights=stock, minlength=n_groups) / n_valid
+        market_mean = np.bincount(codes, weights=market, minlength=n_groups) / n_valid
+        stock_dev = stock - stock_mean[codes]
+        market_dev = market - market_mean[codes]
+        covariance = np.bincount(
+            codes, weights=stock_dev * market_dev, minlength=n_groups
+        )
+        market_variance = np.bincount(
+            codes, weights=market_dev * market_dev, minlength=n_groups
+        )
+
+        # ddof cancels in the ratio
+        beta = np.where(
+            (n_valid >= MIN_BETA_OBSERVATIONS) & (market_variance > 0),
+            covariance / market_variance,
+            np.nan,
+        )
+
+    return pd.Series(beta, index=pd.Index(uniques))
+
+
+def ticker_return_stats(
+    df: pd.DataFrame,
+    ticker_col: str = "Ticker",
+    return_col: str = "Return",
+    excess_return_col: str = "Excess_Return",
+    market_return_col: str = None,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    Compute per-ticker return statistics.
+
+    Datasets of at least NUMBA_MIN_ROWS rows use the numba kernel when
+    numba is installed; smaller ones use the grouped pandas aggregations,
+    which finish before the kernel could be compiled or loaded.
+
+    Statistics (STAT_COLUMNS):
+    - Trading_Days: number of rows
+    - Mean_Return / Return_Std: mean and sample std of daily returns
+    - Mean_Excess_Return / Excess_Return_Std: same for excess returns
+    - Growth: product of (1 + return)
+    - Max_Drawdown: worst decline of cumulative growth from its running peak
+    - Beta: Cov(return, market) / Var(market), NaN with fewer than
+      MIN_BETA_OBSERVATIONS paired observations or without market returns
+    - Negative_Days / Downside_Std: count and sample std of negative returns
+    - VaR_5pct: VAR_QUANTILE quantile of daily returns
+
+    Args:
+        df: DataFrame with daily returns
+        ticker_col: Name of ticker column
+        return_col: Name of return column
+        excess_return_col: Name of excess return column
+        market_return_col: Name of market return column (None skips beta)
+        n_jobs: Threads the tickers are split across (-1 uses all cores);
+            ignored by the pandas path
+
+    Returns:
+        DataFrame indexed by ticker (in order of first appearance)
+    """
+    if njit is None or len(df) < NUMBA_MIN_ROWS:
+        return pandas_group_stats(
+            df, ticker_col, return_col, excess_return_col, market_return_col
+        )
+
+    # Codes follow first appearance, so they never decrease when each
+    # ticker's rows are already contiguous (e.g. the ticker/date-sorted
+    # master dataset); only otherwise are rows gathered into ticker order,
+    # leaving out rows without a ticker as groupby does
+    codes, tickers = pd.factorize(df[ticker_col], sort=False)
+    if len(codes) > 0 and codes[0] >= 0 and np.all(codes[1:] >= codes[:-1]):
+        order = None
+        group_sizes = np.bincount(codes, minlength=len(tickers))
+    else:
+        rows = np.flatnonzero(codes >= 0)
+        order = rows[np.argsort(codes[rows], kind="stable")]
+        group_sizes = np.bincount(codes[rows], minlength=len(tickers))
+
+    offsets = np.zeros(len(tickers) + 1, dtype=np.int64)
+    np.cumsum(group_sizes, out=offsets[1:])
+
+    def column_values(col):
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        if order is not None:
+            values = values[order]
+        return np.ascontiguousarray(values)
+
+    returns = column_values(return_col)
+    excess = column_values(excess_return_col)
+    if market_return_col is None:
+        market = np.full(len(returns), np.nan)
+    else:
+        market = column_values(market_return_col)
+
+    # Tickers are independent, so the kernel's prange hands each thread a
+    # share of them over the same shared arrays (nothing is pickled)
+    n_threads = config.NUMBA_NUM_THREADS if n_jobs < 1 else n_jobs
+    previous_threads = get_num_threads()
+    set_num_threads(min(n_threads, config.NUMBA_NUM_THREADS))
+    try:
+        out = group_stats_kernel(
+            returns, excess, market, offsets, MIN_BETA_OBSERVATIONS, VAR_QUANTILE
+        )
+    finally:
+        set_num_threads(previous_threads)
+    stats = pd.DataFrame(out, index=tickers, columns=STAT_COLUMNS)
+    stats["Trading_Days"] = stats["Trading_Days"].astype(np.int64)
+    stats["Negative_Days"] = stats["Negative_Days"].astype(np.int64)
+    return stats
@@ -5,12 +5,15 @@ Calculate performance metrics: Sharpe ratio, excess returns, cumulative returns.
 import numpy as np
 import pandas as pd
 
+from src.feature_engineering.group_stats import ticker_return_stats
+
 
 def calculate_performance_metrics(
     df: pd.DataFrame,
     ticker_col: str = "Ticker",
     return_col: str = "Return",
     excess_return_col: str = "Excess_Return",
+    stats: pd.DataFrame = None,
 ) -> pd.DataFrame:
     """
     Calculate performance metrics for each ticker over the full time period.
@@ -26,6 +29,8 @@ def calculate_performance_metrics(
         ticker_col: Name of ticker column
         return_col: Name of return column
         excess_return_col: Name of excess return column
+        stats: Precomputed ticker_return_stats output for df (computed here
+            when None)
 
     Returns:
         DataFrame with one row per ticker and performance metrics
@@ -41,80 +46,92 @@ def calculate_performance_metrics(
     # Group by ticker and calculate metrics
     print("\n[PROCESSING] Calculating metrics for each ticker...")
 
-    results = []
-
-    for ticker in df[ticker_col].unique():
-        ticker_data = df[df[ticker_col] == ticker].copy()
-
-        # Skip if insufficient data
-        if len(ticker_data) < 200:  # Require at least 200 trading days (~8 months)
-            print(f"\t[WARNING] Skipping {ticker}: only {len(ticker_data)} trading days")
-            continue
+    # One pass over the data for every ticker's statistics
+    if stats is None:
+        stats = ticker_return_stats(df, ticker_col, return_col, excess_return_col)
+    n_days = stats["Trading_Days"]
 
-        metrics = {"Ticker": ticker}
+    # Skip tickers with insufficient data
+    # Require at least 200 trading days (~8 months)
+    for ticker, days in n_days[n_days < 200].items():
+        print(f"\t[WARNING] Skipping {ticker}: only {days} trading days")
 
-        # Number of trading days
-        metrics["Trading_Days"] = len(ticker_data)
+    stats = stats[n_days >= 200]
+    n_days = stats["Trading_Days"]
 
-        # 1. Mean daily excess return
-        mean_excess_return = ticker_data[excess_return_col].mean()
-        metrics["Mean_Daily_Excess_Return"] = mean_excess_return
+    # 1. Mean daily excess return
+    mean_excess_return = stats["Mean_Excess_Return"]
 
-        # 2. Annualized excess return
-        # Assuming 252 trading days per year
-        metrics["Annualized_Excess_Return"] = mean_excess_return * 252
+    # 2. Annualized excess return
+    # Assuming 252 trading days per year
+    annualized_excess_return = mean_excess_return * 252
 
-        # 3. Sharpe Ratio (annualized)
-        # Sharpe = (mean excess return / std of excess returns) * sqrt(252)
-        std_excess_return = ticker_data[excess_return_col].std()
-        if std_excess_return > 0:
-            metrics["Sharpe_Ratio"] = (
-                mean_excess_return / std_excess_return
-            ) * np.sqrt(252)
-        else:
-            metrics["Sharpe_Ratio"] = 0.0
+    # 3. Sharpe Ratio (annualized)
+    # Sharpe = (mean excess return / std of excess returns) * sqrt(252)
+    std_excess_return = stats["Excess_Return_Std"]
+    sharpe_ratio = (mean_excess_return / std_excess_return * np.sqrt(252)).where(
+        std_excess_return > 0, 0.0
+    )
 
-        # 4. Cumulative return
-        # (1 + R1) * (1 + R2) * ... * (1 + Rn) - 1
-        metrics["Cumulative_Return"] = (1 + ticker_data[return_col]).prod() - 1
+    # 4. Cumulative return
+    # (1 + R1) * (1 + R2) * ... * (1 + Rn) - 1
+    cumulative_return = stats["Growth"] - 1
 
-        # 5. Annualized return (geometric mean)
-        # (1 + cumulative_return) ^ (252 / n_days) - 1
-        n_days = len(ticker_data)
-        metrics["Annualized_Return"] = (1 + metrics["Cumulative_Return"]) ** (
-            252 / n_days
-        ) - 1
+    # 5. Annualized return (geometric mean)
+    # (1 + cumulative_return) ^ (252 / n_days) - 1
+    annualized_return = (1 + cumulative_return) ** (252 / n_days) - 1
 
-        # 6. Mean daily return
-        metrics["Mean_Daily_Return"] = ticker_data[return_col].mean()
-
-        results.append(metrics)
+    # 6. Mean daily return
+    mean_return = stats["Mean_Return"]
 
     # Create DataFrame
-    performance_df = pd.DataFrame(results)
+    performance_df = pd.DataFrame(
+        {
+            "Trading_Days": n_days,
+            "Mean_Daily_Excess_Return": mean_excess_return,
+            "Annualized_Excess_Return": annualized_excess_return,
+            "Sharpe_Ratio": sharpe_ratio,
+            "Cumulative_Return": cumulative_return,
+            "Annualized_Return": annualized_return,
+            "Mean_Daily_Return": mean_return,
+        }
+    )
+    # Tickers stay categorical so later merges compare integer codes
+    performance_df.insert(0, "Ticker", pd.Categorical(performance_df.index))
+    performance_df = performance_df.reset_index(drop=True)
 
     print(f"\n[OK] Calculated metrics for {len(performance_df)} tickers")
 
-    # Summary statistics
-    print("\n[STATS] Performance Metrics Summary:")
-    print("\nSharpe Ratio:")
-    print(f"\tMean: {performance_df['Sharpe_Ratio'].mean():.4f}")
-    print(f"\tMedian: {performance_df['Sharpe_Ratio'].median():.4f}")
-    print(f"\tStd: {performance_df['Sharpe_Ratio'].std():.4f}")
-    print(f"\tMin: {performance_df['Sharpe_Ratio'].min():.4f}")
-    print(f"\tMax: {performance_df['Sharpe_Ratio'].max():.4f}")
-
-    print("\nAnnualized Excess Return:")
-    print(f"\tMean: {performance_df['Annualized_Excess_Return'].mean():.2%}")
-    print(f"\tMedian: {performance_df['Annualized_Excess_Return'].median():.2%}")
-    print(f"\tMin: {performance_df['Annualized_Excess_Return'].min():.2%}")
-    print(f"\tMax: {performance_df['Annualized_Excess_Return'].max():.2%}")
-
-    print("\nCumulative Return:")
-    print(f"\tMean: {performance_df['Cumulative_Return'].mean():.2%}")
-    print(f"\tMedian: {performance_df['Cumulative_Return'].median():.2%}")
-    print(f"\tMin: {performance_df['Cumulative_Return'].min():.2%}")
-    print(f"\tMax: {performance_df['Cumulative_Return'].max():.2%}")
+    # Summary statistics, aggregated per column and printed as one block
+    summary = performance_df[
+        ["Sharpe_Ratio", "Annualized_Excess_Return", "Cumulative_Return"]
+    ].agg(["mean", "median", "std", "min", "max"])
+    sharpe = summary["Sharpe_Ratio"]
+    excess = summary["Annualized_Excess_Return"]
+    cumulative = summary["Cumulative_Return"]
+    print(
+        "\n".join(
+            [
+                "\n[STATS] Performance Metrics Summary:",
+                "\nSharpe Ratio:",
+                f"\tMean: {sharpe['mean']:.4f}",
+                f"\tMedian: {sharpe['median']:.4f}",
+                f"\tStd: {sharpe['std']:.4f}",
+                f"\tMin: {sharpe['min']:.4f}",
+                f"\tMax: {sharpe['max']:.4f}",
+                "\nAnnualized Excess Return:",
+                f"\tMean: {excess['mean']:.2%}",
+                f"\tMedian: {excess['median']:.2%}",
+                f"\tMin: {excess['min']:.2%}",
+                f"\tMax: {excess['max']:.2%}",
+                "\nCumulative Return:",
+                f"\tMean: {cumulative['mean']:.2%}",
+                f"\tMedian: {cumulative['median']:.2%}",
+                f"\tMin: {cumulative['min']:.2%}",
+                f"\tMax: {cumulative['max']:.2%}",
+            ]
+        )
+    )
 
     # Display sample
     print("\n[INFO] Sample results:")
@@ -127,6 +144,11 @@ def calculate_performance_metrics(
     ]
     print(performance_df[display_cols].head(10))
 
+    # Summary statistics need no more than float32 precision, which halves
+    # the bytes moved through the merges and writes downstream
+    float_cols = performance_df.select_dtypes("float64").columns
+    performance_df = performance_df.astype({col: "float32" for col in float_cols})
+
     return performance_df
 
 
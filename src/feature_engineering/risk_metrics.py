@@ -5,6 +5,8 @@ Calculate risk metrics: volatility, beta, downside deviation.
 import numpy as np
 import pandas as pd
 
+from src.feature_engineering.group_stats import ticker_return_stats
+
 
 def calculate_risk_metrics(
     df: pd.DataFrame,
@@ -12,6 +14,7 @@ def calculate_risk_metrics(
     return_col: str = "Return",
     excess_return_col: str = "Excess_Return",
     market_return_col: str = "Market_Return",
+    stats: pd.DataFrame = None,
 ) -> pd.DataFrame:
     """
     Calculate risk metrics for each ticker over the full time period.
@@ -27,6 +30,8 @@ def calculate_risk_metrics(
         return_col: Name of return column
         excess_return_col: Name of excess return column
         market_return_col: Name of market return column
+        stats: Precomputed ticker_return_stats output for df, including beta
+            when market returns are available (computed here when None)
 
     Returns:
         DataFrame with one row per ticker and risk metrics
@@ -45,115 +50,102 @@ def calculate_risk_metrics(
     )
 
     if not has_market_returns:
-        print("\n[WARNING] Market returns not available, beta calculation will be skipped")
+        print(
+            "\n[WARNING] Market returns not available, beta calculation will be skipped"
+        )
 
     # Group by ticker and calculate metrics
     print("\n[PROCESSING] Calculating metrics for each ticker...")
 
-    results = []
-
-    for ticker in df[ticker_col].unique():
-        ticker_data = df[df[ticker_col] == ticker].copy()
-
-        # Skip if insufficient data
-        if len(ticker_data) < 200:
-            continue
-
-        metrics = {"Ticker": ticker}
-
-        # 1. Volatility (annualized standard deviation of returns)
-        daily_std = ticker_data[return_col].std()
-        metrics["Volatility"] = daily_std * np.sqrt(252)
-
-        # 2. Beta (if market returns available)
-        if has_market_returns:
-            # Remove NaN values
-            valid_data = ticker_data[[return_col, market_return_col]].dropna()
-
-            if len(valid_data) >= 100:  # Need sufficient data for regression
-                # Calculate beta using covariance method
-                # Beta = Cov(stock_return, market_return) / Var(market_return)
-                cov_matrix = np.cov(
-                    valid_data[return_col], valid_data[market_return_col]
-                )
-                covariance = cov_matrix[0, 1]
-                market_variance = cov_matrix[1, 1]
-
-                if market_variance > 0:
-                    metrics["Beta"] = covariance / market_variance
-                else:
-                    metrics["Beta"] = np.nan
-
-                # Alternative: Use linear regression for beta (should give same result)
-                # slope, intercept, r_value, p_value, std_err = stats.linregress(
-                #     valid_data[market_return_col], valid_data[return_col]
-                # )
-                # metrics['Beta'] = slope
-                # metrics['Beta_R_Squared'] = r_value ** 2
-
-            else:
-                metrics["Beta"] = np.nan
-        else:
-            metrics["Beta"] = np.nan
-
-        # 3. Downside deviation (semi-deviation - only negative returns)
-        # This measures downside risk
-        negative_returns = ticker_data[ticker_data[return_col] < 0][return_col]
-
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std()
-            metrics["Downside_Deviation"] = downside_std * np.sqrt(252)
-        else:
-            metrics["Downside_Deviation"] = 0.0
-
-        # 4. Standard deviation of excess returns (for Sharpe calculation verification)
-        metrics["Excess_Return_Std"] = ticker_data[excess_return_col].std() * np.sqrt(
-            252
+    # One pass over the data for every ticker's statistics
+    if stats is None:
+        stats = ticker_return_stats(
+            df,
+            ticker_col,
+            return_col,
+            excess_return_col,
+            market_return_col if has_market_returns else None,
         )
+    # Skip if insufficient data
+    stats = stats[stats["Trading_Days"] >= 200]
+
+    # 1. Volatility (annualized standard deviation of returns)
+    volatility = stats["Return_Std"] * np.sqrt(252)
+
+    # 2. Beta (if market returns available)
+    # Beta = Cov(stock_return, market_return) / Var(market_return), NaN
+    # without enough paired observations for a regression
+    beta = stats["Beta"]
+
+    # 3. Downside deviation (semi-deviation - only negative returns)
+    # This measures downside risk
+    downside_deviation = (stats["Downside_Std"] * np.sqrt(252)).where(
+        stats["Negative_Days"] > 0, 0.0
+    )
 
-        # 5. Value at Risk (VaR) - 5% worst case daily return
-        metrics["VaR_5pct"] = ticker_data[return_col].quantile(0.05)
+    # 4. Standard deviation of excess returns (for Sharpe calculation verification)
+    excess_return_std = stats["Excess_Return_Std"] * np.sqrt(252)
 
-        # 6. Maximum drawdown
-        cumulative_returns = (1 + ticker_data[return_col]).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        metrics["Max_Drawdown"] = drawdown.min()
+    # 5. Value at Risk (VaR) - 5% worst case daily return
+    var_5pct = stats["VaR_5pct"]
 
-        results.append(metrics)
+    # 6. Maximum drawdown
+    max_drawdown = stats["Max_Drawdown"]
 
     # Create DataFrame
-    risk_df = pd.DataFrame(results)
+    risk_df = pd.DataFrame(
+        {
+            "Volatility": volatility,
+            "Beta": beta,
+            "Downside_Deviation": downside_deviation,
+            "Excess_Return_Std": excess_return_std,
+            "VaR_5pct": var_5pct,
+            "Max_Drawdown": max_drawdown,
+        }
+    )
+    # Tickers stay categorical so later merges compare integer codes
+    risk_df.insert(0, "Ticker", pd.Categorical(risk_df.index))
+    risk_df = risk_df.reset_index(drop=True)
 
     print(f"\n[OK] Calculated metrics for {len(risk_df)} tickers")
 
-    # Summary statistics
-    print("\n[STATS] Risk Metrics Summary:")
-
-    print("\nVolatility (Annualized):")
-    print(f"\tMean: {risk_df['Volatility'].mean():.2%}")
-    print(f"\tMedian: {risk_df['Volatility'].median():.2%}")
-    print(f"\tMin: {risk_df['Volatility'].min():.2%}")
-    print(f"\tMax: {risk_df['Volatility'].max():.2%}")
-
-    if has_market_returns and risk_df["Beta"].notna().any():
-        print("\nBeta:")
-        print(f"\tMean: {risk_df['Beta'].mean():.4f}")
-        print(f"\tMedian: {risk_df['Beta'].median():.4f}")
-        print(f"\tMin: {risk_df['Beta'].min():.4f}")
-        print(f"\tMax: {risk_df['Beta'].max():.4f}")
-        print(
-            f"\t% with Beta > 1 (more volatile than market): {(risk_df['Beta'] > 1).sum() / len(risk_df) * 100:.1f}%"
-        )
-
-    print("\nDownside Deviation:")
-    print(f"\tMean: {risk_df['Downside_Deviation'].mean():.2%}")
-    print(f"\tMedian: {risk_df['Downside_Deviation'].median():.2%}")
+    # Summary statistics, aggregated per column and printed as one block
+    summary = risk_df[["Volatility", "Beta", "Downside_Deviation", "Max_Drawdown"]].agg(
+        ["mean", "median", "min", "max", "count"]
+    )
+    volatility = summary["Volatility"]
+    lines = [
+        "\n[STATS] Risk Metrics Summary:",
+        "\nVolatility (Annualized):",
+        f"\tMean: {volatility['mean']:.2%}",
+        f"\tMedian: {volatility['median']:.2%}",
+        f"\tMin: {volatility['min']:.2%}",
+        f"\tMax: {volatility['max']:.2%}",
+    ]
+
+    beta = summary["Beta"]
+    if has_market_returns and beta["count"] > 0:
+        lines += [
+            "\nBeta:",
+            f"\tMean: {beta['mean']:.4f}",
+            f"\tMedian: {beta['median']:.4f}",
+            f"\tMin: {beta['min']:.4f}",
+            f"\tMax: {beta['max']:.4f}",
+            f"\t% with Beta > 1 (more volatile than market): {(risk_df['Beta'] > 1).sum() / len(risk_df) * 100:.1f}%",
+        ]
 
-    print("\nMax Drawdown:")
-    print(f"\tMean: {risk_df['Max_Drawdown'].mean():.2%}")
-    print(f"\tMedian: {risk_df['Max_Drawdown'].median():.2%}")
-    print(f"\tWorst: {risk_df['Max_Drawdown'].min():.2%}")
+    downside = summary["Downside_Deviation"]
+    drawdown = summary["Max_Drawdown"]
+    lines += [
+        "\nDownside Deviation:",
+        f"\tMean: {downside['mean']:.2%}",
+        f"\tMedian: {downside['median']:.2%}",
+        "\nMax Drawdown:",
+        f"\tMean: {drawdown['mean']:.2%}",
+        f"\tMedian: {drawdown['median']:.2%}",
+        f"\tWorst: {drawdown['min']:.2%}",
+    ]
+    print("\n".join(lines))
 
     # Display sample
     print("\n[INFO] Sample results:")
@@ -169,6 +161,11 @@ def calculate_risk_metrics(
         display_cols = ["Ticker", "Volatility", "Downside_Deviation", "Max_Drawdown"]
     print(risk_df[display_cols].head(10))
 
+    # Summary statistics need no more than float32 precision, which halves
+    # the bytes moved through the merges and writes downstream
+    float_cols = risk_df.select_dtypes("float64").columns
+    risk_df = risk_df.astype({col: "float32" for col in float_cols})
+
     return risk_df
 
 
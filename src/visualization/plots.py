@@ -2,29 +2,226 @@
 Create visualizations for ESG analysis.
 """
 
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import matplotlib
+import matplotlib.font_manager
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 import pandas as pd
 import seaborn as sns
 import statsmodels.api as sm
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams["figure.figsize"] = (10, 6)
-plt.rcParams["figure.dpi"] = 100
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Style applied while create_all_plots draws, rather than at import, so
+# importing this module leaves the caller's matplotlib configuration alone.
+# matplotlib's bundled font means text layout never searches system fonts.
+PLOT_RC_PARAMS = {
+    **sns.axes_style("whitegrid"),
+    "figure.figsize": (10, 6),
+    "figure.dpi": 100,
+    "font.family": "DejaVu Sans",
+}
+
+# Load the font cache once here rather than on the first figure; this only
+# fills matplotlib's font lookup cache and changes no settings
+matplotlib.font_manager.fontManager.findfont(PLOT_RC_PARAMS["font.family"])
+
+# Resolution of saved figures
+DEFAULT_SAVE_DPI = 150
+
+# zlib level for saved PNGs; the flat plot images compress nearly as well
+# at 3 as at Pillow's default 6, in a fraction of the time
+PNG_COMPRESS_LEVEL = 3
+
+# Heatmap cells are labelled with their values up to this many variables
+MAX_ANNOTATED_VARIABLES = 12
+
+# Columns read by the plots besides the heatmap variables and sector dummies
+PLOT_COLUMNS = [
+    "totalEsg",
+    "Sharpe_Ratio",
+    "Volatility",
+    "Log_Market_Cap",
+    "environmentScore",
+    "socialScore",
+    "governanceScore",
+]
+
+# Scatter plots draw at most this many points (fits still use every row)
+MAX_SCATTER_POINTS = 5000
+
+# Input digests are kept in this hidden subdirectory of the figure directory,
+# one '<figure name>.sha' file per figure
+DIGEST_DIR_NAME = ".digests"
+
+# Code key hashed into every digest, so editing this module or upgrading
+# matplotlib redraws the figures even when their inputs are unchanged
+PLOT_CODE_KEY = (
+    hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest(),
+    matplotlib.__version__,
+)
+
+# DataFrame being plotted and the figure reused for each plot, set once per
+# worker process by init_plot_worker
+worker_df = None
+worker_fig = None
+
+
+def input_digest(data: pd.DataFrame, dpi: int, fmt: str) -> str:
+    """
+    Fingerprint the data a plot reads, how it is saved and the plotting code.
+
+    Args:
+        data: Columns the plot uses
+        dpi: Resolution of the saved figure
+        fmt: Output format ('png' or 'svg')
+
+    Returns:
+        Hex BLAKE2b digest
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(
+        repr(
+            (PLOT_CODE_KEY, list(data.columns), list(map(str, data.dtypes)), dpi, fmt)
+        ).encode()
+    )
+    hasher.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def digest_path(output_path: Path) -> Path:
+    """
+    Get the file holding the input digest of a saved figure.
+
+    Args:
+        output_path: Path of the saved figure
+
+    Returns:
+        Path of the digest file in the figure directory's digest cache
+    """
+    return output_path.parent / DIGEST_DIR_NAME / (output_path.name + ".sha")
+
+
+def plot_is_current(output_path: Path, digest: str) -> bool:
+    """
+    Check whether a saved figure was drawn from the same inputs.
+
+    The digest of the inputs is stored in the digest cache by save_figure,
+    so an unchanged figure can be kept without drawing it again.
+
+    Args:
+        output_path: Path of the saved figure
+        digest: input_digest of the current inputs
+
+    Returns:
+        True if the figure exists and its stored digest matches
+    """
+    stored_digest = digest_path(output_path)
+    if (
+        output_path.exists()
+        and stored_digest.exists()
+        and stored_digest.read_text() == digest
+    ):
+        print(f"[OK] Inputs unchanged, keeping: {output_path}")
+        return True
+    return False
+
+
+def save_figure(fig: plt.Figure, output_path: Path, dpi: int, digest: str) -> None:
+    """
+    Save a figure and record the digest of the inputs it was drawn from.
+
+    The format follows the file suffix. SVG is written as text, with no
+    rasterization or compression, so it is the faster choice for report
+    generation; PNG suits embedding (e.g. in the README). The image is
+    rendered into memory and written to disk with a single write.
+
+    Args:
+        fig: Figure to save
+        output_path: Path of the '.png' or '.svg' file
+        dpi: Resolution of the saved figure (of rasterized layers for SVG)
+        digest: input_digest of the plot's inputs
+    """
+    buffer = io.BytesIO()
+    fmt = output_path.suffix.lstrip(".")
+    if fmt == "png":
+        fig.savefig(
+            buffer,
+            format=fmt,
+            dpi=dpi,
+            pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL},
+        )
+    else:
+        fig.savefig(buffer, format=fmt, dpi=dpi)
+    output_path.write_bytes(buffer.getbuffer())
+    stored_digest = digest_path(output_path)
+    stored_digest.parent.mkdir(exist_ok=True)
+    stored_digest.write_text(digest)
+    print(f"[OK] Saved to: {output_path}")
+
+
+def prepare_axes(fig: plt.Figure, figsize: tuple) -> tuple:
+    """
+    Get a figure with one empty Axes for a plot.
+
+    A figure passed in is cleared and resized so it can be reused across
+    plots; otherwise a new one is created.
+
+    Args:
+        fig: Figure to reuse, or None to create one
+        figsize: Figure size in inches (width, height)
+
+    Returns:
+        Tuple of (figure, axes)
+    """
+    if fig is None:
+        fig = plt.figure(figsize=figsize)
+    else:
+        fig.clear()
+        fig.set_size_inches(figsize)
+    return fig, fig.add_subplot(111)
 
 
 def plot_esg_distribution(
-    df: pd.DataFrame, output_dir: str = "outputs/figures"
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
 ) -> None:
     """Plot distribution of ESG scores."""
     print("\n[INFO] Creating ESG score distribution plot...")
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    output_path = Path(output_dir) / f"esg_distribution.{fmt}"
+    digest = input_digest(df[["totalEsg"]], dpi, fmt)
+    if plot_is_current(output_path, digest):
+        return
 
-    ax.hist(df["totalEsg"].dropna(), bins=30, edgecolor="black", alpha=0.7)
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(10, 6))
+
+    # Bin with NumPy and draw the bars directly, skipping hist's bookkeeping
+    counts, edges = np.histogram(df["totalEsg"].dropna().to_numpy(), bins=30)
+    ax.bar(
+        edges[:-1],
+        counts,
+        width=np.diff(edges),
+        align="edge",
+        edgecolor="black",
+        alpha=0.7,
+    )
     ax.set_xlabel("ESG Score")
     ax.set_ylabel("Frequency")
     ax.set_title("Distribution of ESG Scores")
@@ -35,39 +232,223 @@ def plot_esg_distribution(
     ax.axvline(mean_esg, color="red", linestyle="--", label=f"Mean: {mean_esg:.2f}")
     ax.legend()
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "esg_distribution.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
+
+
+def decode_one_hot(block: np.ndarray) -> np.ndarray:
+    """
+    Decode a one-hot block into column indices.
+
+    Args:
+        block: 2-D int8 array of 0/1 dummies, one row per observation
+
+    Returns:
+        int32 array with the first set column of each row (-1 when none is)
+    """
+    n_rows, n_cols = block.shape
+    out = np.empty(n_rows, dtype=np.int32)
+    for i in range(n_rows):
+        idx = -1
+        for j in range(n_cols):
+            if block[i, j] == 1:
+                idx = j
+                break
+        out[i] = idx
+    return out
+
+
+if njit is not None:
+    decode_one_hot = njit(cache=True)(decode_one_hot)
+else:
+
+    def decode_one_hot(block: np.ndarray) -> np.ndarray:
+        """
+        Decode a one-hot block into column indices (NumPy fallback).
+
+        Args:
+            block: 2-D int8 array of 0/1 dummies, one row per observation
+
+        Returns:
+            int32 array with the first set column of each row (-1 when none is)
+        """
+        is_set = block == 1
+        return np.where(is_set.any(axis=1), is_set.argmax(axis=1), -1).astype(np.int32)
+
+
+def grouped_box_stats(values: pd.Series, groups: pd.Series) -> list:
+    """
+    Compute box plot statistics for each group, as ax.boxplot would.
+
+    Quartiles come from one grouped quantile; whiskers reach the most
+    extreme values within 1.5 IQR of the box, and values beyond them are
+    fliers (matplotlib's defaults).
+
+    Args:
+        values: Values to summarize
+        groups: Group label of each value
+
+    Returns:
+        List of ax.bxp statistics dicts, one per group in sorted order
+    """
+    grouped = values.groupby(groups, sort=True)
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    q1 = quartiles[0.25]
+    q3 = quartiles[0.75]
+    iqr = q3 - q1
+
+    # Whisker ends: the extreme values inside the 1.5 IQR fences
+    row_q1 = q1.reindex(groups).to_numpy()
+    row_q3 = q3.reindex(groups).to_numpy()
+    row_iqr = row_q3 - row_q1
+    inside = (values.to_numpy() >= row_q1 - 1.5 * row_iqr) & (
+        values.to_numpy() <= row_q3 + 1.5 * row_iqr
+    )
+    whiskers = values[inside].groupby(groups[inside], sort=True).agg(["min", "max"])
+    whislo = whiskers["min"].reindex(q1.index).fillna(q1)
+    whishi = whiskers["max"].reindex(q3.index).fillna(q3)
+
+    row_lo = whislo.reindex(groups).to_numpy()
+    row_hi = whishi.reindex(groups).to_numpy()
+    is_flier = (values.to_numpy() < row_lo) | (values.to_numpy() > row_hi)
+    fliers = values[is_flier].groupby(groups[is_flier], sort=True)
+
+    return [
+        {
+            "label": group,
+            "q1": q1[group],
+            "med": quartiles.loc[group, 0.5],
+            "q3": q3[group],
+            "iqr": iqr[group],
+            "whislo": whislo[group],
+            "whishi": whishi[group],
+            "fliers": (
+                fliers.get_group(group).to_numpy()
+                if group in fliers.groups
+                else np.array([])
+            ),
+        }
+        for group in quartiles.index
+    ]
+
+
+def scatter_sample(plot_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return at most MAX_SCATTER_POINTS rows of plot_df for drawing.
+
+    Beyond that many markers the scatter is overplotted anyway, while Agg
+    still strokes every one. The sample is fixed (random_state=0), so
+    figures are reproducible.
+
+    Args:
+        plot_df: Rows to plot
+
+    Returns:
+        plot_df itself, or a random sample of it
+    """
+    if len(plot_df) <= MAX_SCATTER_POINTS:
+        return plot_df
+    return plot_df.sample(n=MAX_SCATTER_POINTS, random_state=0)
+
+
+def pairwise_corr(values: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation matrix over pairwise-complete observations.
+
+    Matches DataFrame.corr(): each pair of columns uses the rows where both
+    are present. Without missing values the columns are standardized once
+    and the whole matrix is a single product; otherwise the masked sums for
+    every pair are formed with a few matrix products on the column-centered
+    values (centering keeps the one-pass sums accurate in float32).
+
+    Args:
+        values: 2-D array with one variable per column (NaN marks missing)
+
+    Returns:
+        Square correlation matrix (NaN where a pair has no variance)
+    """
+    values = values - np.nanmean(values, axis=0)
+    present = ~np.isnan(values)
+
+    if present.all():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = values / np.sqrt((values * values).sum(axis=0))
+        return values.T @ values
+
+    weights = present.astype(values.dtype)
+    values = np.where(present, values, 0)
+
+    # sums[i, j] is the sum of column i over rows where column j is present
+    n = weights.T @ weights
+    sums = values.T @ weights
+    squares = (values * values).T @ weights
+    products = values.T @ values
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = products - sums * sums.T / n
+        variance = squares - sums * sums / n
+        return covariance / np.sqrt(variance * variance.T)
+
+
+def heatmap_columns(columns: pd.Index) -> list:
+    """
+    Pick the key variables shown in the correlation heatmap.
+
+    Args:
+        columns: Columns of the analysis dataset
+
+    Returns:
+        Names of ESG, performance, risk and market cap columns (no sectors)
+    """
+    names = columns.str.lower()
+    key_mask = names.str.contains(
+        "esg|sharpe|volatility|beta|return|market_cap"
+    ) & ~names.str.contains("sector", regex=False)
+    return columns[key_mask].tolist()
 
 
 def plot_correlation_heatmap(
-    df: pd.DataFrame, output_dir: str = "outputs/figures"
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
 ) -> None:
     """Plot correlation heatmap of key variables."""
     print("\n[INFO] Creating correlation heatmap...")
 
     # Select key columns
-    key_cols = []
-    for col in df.columns:
-        if any(
-            k in col.lower()
-            for k in ["esg", "sharpe", "volatility", "beta", "return", "market_cap"]
-        ):
-            if "sector" not in col.lower():
-                key_cols.append(col)
+    key_cols = heatmap_columns(df.columns)
 
     if len(key_cols) < 2:
         print("[WARNING]  Not enough variables for correlation matrix")
         return
 
-    corr_df = df[key_cols].corr()
+    output_path = Path(output_dir) / f"correlation_heatmap.{fmt}"
+    digest = input_digest(df[key_cols], dpi, fmt)
+    if plot_is_current(output_path, digest):
+        return
 
-    fig, ax = plt.subplots(figsize=(12, 10))
+    # float32 halves the data scanned; two decimals are shown on the map
+    corr_df = pd.DataFrame(
+        pairwise_corr(df[key_cols].to_numpy(dtype=np.float32)),
+        index=key_cols,
+        columns=key_cols,
+    )
+
+    # The matrix is symmetric, so only the lower triangle and diagonal are
+    # drawn; each annotation is a separately laid-out text, so wide
+    # matrices are left unlabelled
+    upper_triangle = np.triu(np.ones(corr_df.shape, dtype=bool), k=1)
+
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(12, 10))
     sns.heatmap(
         corr_df,
-        annot=True,
+        mask=upper_triangle,
+        annot=len(key_cols) <= MAX_ANNOTATED_VARIABLES,
         fmt=".2f",
         cmap="coolwarm",
         center=0,
@@ -77,29 +458,50 @@ def plot_correlation_heatmap(
     )
     ax.set_title("Correlation Matrix of Key Variables")
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "correlation_heatmap.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
 
 
-def plot_esg_vs_sharpe(df: pd.DataFrame, output_dir: str = "outputs/figures") -> None:
+def plot_esg_vs_sharpe(
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
+) -> None:
     """Scatter plot of ESG score vs Sharpe ratio."""
     print("\n[INFO] Creating ESG vs Sharpe ratio scatter plot...")
 
+    output_path = Path(output_dir) / f"esg_vs_sharpe.{fmt}"
+    digest = input_digest(df[["totalEsg", "Sharpe_Ratio"]], dpi, fmt)
+    if plot_is_current(output_path, digest):
+        return
+
     plot_df = df[["totalEsg", "Sharpe_Ratio"]].dropna()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(10, 6))
+
+    points = scatter_sample(plot_df)
+    ax.scatter(
+        points["totalEsg"], points["Sharpe_Ratio"], alpha=0.5, s=50, rasterized=True
+    )
 
-    ax.scatter(plot_df["totalEsg"], plot_df["Sharpe_Ratio"], alpha=0.5, s=50)
+    # Add regression line (closed-form least squares; no polyfit solve
+    # needed for a straight line)
+    x = plot_df["totalEsg"].to_numpy(dtype=np.float64)
+    y = plot_df["Sharpe_Ratio"].to_numpy(dtype=np.float64)
+    x_dev = x - x.mean()
+    slope = (x_dev * (y - y.mean())).sum() / (x_dev * x_dev).sum()
+    intercept = y.mean() - slope * x.mean()
 
-    # Add regression line
-    z = np.polyfit(plot_df["totalEsg"], plot_df["Sharpe_Ratio"], 1)
-    p = np.poly1d(z)
+    # A straight line only needs its two endpoints
+    x_ends = np.array([x.min(), x.max()])
     ax.plot(
-        plot_df["totalEsg"],
-        p(plot_df["totalEsg"]),
+        x_ends,
+        intercept + slope * x_ends,
         "r--",
         alpha=0.8,
         label="Best fit line",
@@ -111,15 +513,18 @@ def plot_esg_vs_sharpe(df: pd.DataFrame, output_dir: str = "outputs/figures") ->
     ax.grid(True, alpha=0.3)
     ax.legend()
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "esg_vs_sharpe.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
 
 
 def plot_esg_vs_volatility(
-    df: pd.DataFrame, output_dir: str = "outputs/figures"
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
 ) -> None:
     """Scatter plot of ESG score vs volatility with controlled regression fit."""
     print("\n[INFO] Creating ESG vs Volatility scatter plot...")
@@ -127,7 +532,14 @@ def plot_esg_vs_volatility(
     plot_df = df[
         ["totalEsg", "Volatility", "Log_Market_Cap"]
         + [c for c in df.columns if c.startswith("Sector_")]
-    ].dropna()
+    ]
+
+    output_path = Path(output_dir) / f"esg_vs_volatility.{fmt}"
+    digest = input_digest(plot_df, dpi, fmt)
+    if plot_is_current(output_path, digest):
+        return
+
+    plot_df = plot_df.dropna()
 
     # Design matrix: ESG + controls (same as RQ2)
     X = plot_df[
@@ -142,7 +554,8 @@ def plot_esg_vs_volatility(
     fitted = model.fittedvalues
 
     # Or, if you prefer a partial regression line: predict over ESG grid with controls at their means
-    esg_grid = np.linspace(plot_df["totalEsg"].min(), plot_df["totalEsg"].max(), 100)
+    # (the prediction is linear in ESG, so the grid is just its two endpoints)
+    esg_grid = np.array([plot_df["totalEsg"].min(), plot_df["totalEsg"].max()])
     controls_means = X.drop(columns=["const", "totalEsg"]).mean()
     X_grid = pd.DataFrame({"const": 1.0, "totalEsg": esg_grid})
     for c in X.columns:
@@ -151,14 +564,17 @@ def plot_esg_vs_volatility(
         X_grid[c] = controls_means[c]
     y_grid = model.predict(X_grid)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(10, 6))
+    points = scatter_sample(plot_df)
     ax.scatter(
-        plot_df["totalEsg"],
-        plot_df["Volatility"],
+        points["totalEsg"],
+        points["Volatility"],
         alpha=0.5,
         s=50,
         color="green",
         label="Data",
+        rasterized=True,
     )
     ax.plot(esg_grid, y_grid, "r--", alpha=0.9, label="OLS fit (with controls)")
 
@@ -169,62 +585,93 @@ def plot_esg_vs_volatility(
     ax.legend()
     ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: "{:.1%}".format(y)))
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "esg_vs_volatility.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
 
 
-def plot_sector_esg(df: pd.DataFrame, output_dir: str = "outputs/figures") -> None:
+def plot_sector_esg(
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
+) -> None:
     """Box plot of ESG scores by sector."""
     print("\n[INFO] Creating ESG scores by sector plot...")
 
     # Reconstruct Sector from dummy variables
     sector_cols = [col for col in df.columns if col.startswith("Sector_")]
 
-    # Create Sector column from dummies
-    df_copy = df.copy()
-    df_copy["Sector"] = "Basic Materials"  # Baseline (dropped category)
-    for col in sector_cols:
-        sector_name = col.replace("Sector_", "")
-        df_copy.loc[df_copy[col] == 1, "Sector"] = sector_name
+    output_path = Path(output_dir) / f"esg_by_sector.{fmt}"
+    digest = input_digest(df[["totalEsg"] + sector_cols], dpi, fmt)
+    if plot_is_current(output_path, digest):
+        return
+
+    # Create Sector labels from dummies: the set dummy of each row names its
+    # sector, and rows with none set are the baseline (dropped category)
+    sector = np.full(len(df), "Basic Materials", dtype=object)
+    if sector_cols:
+        codes = decode_one_hot(df[sector_cols].to_numpy(dtype=np.int8))
+        names = np.array([col.replace("Sector_", "") for col in sector_cols])
+        has_sector = codes >= 0
+        sector[has_sector] = names[codes[has_sector]]
 
-    plot_df = df_copy[["totalEsg", "Sector"]].dropna()
+    plot_df = pd.DataFrame(
+        {"totalEsg": df["totalEsg"].to_numpy(), "Sector": sector}
+    ).dropna()
 
     # Get sector counts and filter sectors with < 5 companies
     sector_counts = plot_df["Sector"].value_counts()
     valid_sectors = sector_counts[sector_counts >= 5].index
     plot_df = plot_df[plot_df["Sector"].isin(valid_sectors)]
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(12, 6))
 
-    plot_df.boxplot(column="totalEsg", by="Sector", ax=ax, rot=45)
+    # Quartiles and whiskers are computed with grouped pandas reductions
+    # and drawn directly, rather than per sector in ax.boxplot
+    ax.bxp(grouped_box_stats(plot_df["totalEsg"], plot_df["Sector"]))
+    ax.tick_params(axis="x", labelrotation=45)
     ax.set_xlabel("Sector")
     ax.set_ylabel("ESG Score")
     ax.set_title("ESG Scores by Sector")
-    plt.suptitle("")  # Remove default title
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "esg_by_sector.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
 
 
 def plot_pillar_comparison(
-    df: pd.DataFrame, output_dir: str = "outputs/figures"
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    fig: plt.Figure = None,
+    fmt: str = "png",
 ) -> None:
     """Bar plot comparing E, S, G pillar averages."""
     print("\n[INFO] Creating ESG pillars comparison plot...")
 
-    pillars = {
-        "Environmental": df["environmentScore"].mean(),
-        "Social": df["socialScore"].mean(),
-        "Governance": df["governanceScore"].mean(),
-    }
+    output_path = Path(output_dir) / f"pillar_comparison.{fmt}"
+    digest = input_digest(
+        df[["environmentScore", "socialScore", "governanceScore"]], dpi, fmt
+    )
+    if plot_is_current(output_path, digest):
+        return
+
+    # One reduction over the three pillar columns
+    pillar_means = np.nanmean(
+        df[["environmentScore", "socialScore", "governanceScore"]].to_numpy(
+            dtype=np.float64
+        ),
+        axis=0,
+    )
+    pillars = dict(zip(["Environmental", "Social", "Governance"], pillar_means))
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+    owns_fig = fig is None
+    fig, ax = prepare_axes(fig, figsize=(8, 6))
 
     bars = ax.bar(
         pillars.keys(), pillars.values(), color=["green", "blue", "orange"], alpha=0.7
@@ -244,15 +691,51 @@ def plot_pillar_comparison(
             va="bottom",
         )
 
-    plt.tight_layout()
-    output_path = Path(output_dir) / "pillar_comparison.png"
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    print(f"[OK] Saved to: {output_path}")
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi, digest)
+    if owns_fig:
+        plt.close(fig)
 
 
-def create_all_plots(df: pd.DataFrame, output_dir: str = "outputs/figures") -> None:
-    """Create all visualization plots."""
+def init_plot_worker(df: pd.DataFrame) -> None:
+    """Store the DataFrame and a reusable figure in a plot worker process."""
+    global worker_df, worker_fig
+    # Workers only save figures to files; select Agg explicitly rather than
+    # relying on the backend the spawned interpreter would pick
+    matplotlib.use("Agg")
+    plt.rcParams.update(PLOT_RC_PARAMS)
+    worker_df = df
+    worker_fig = plt.figure()
+
+
+def run_plot_worker(plot_func, output_dir: str, dpi: int, fmt: str) -> None:
+    """Run one plot function on the worker's DataFrame and figure."""
+    plot_func(worker_df, output_dir, dpi, worker_fig, fmt)
+
+
+def create_all_plots(
+    df: pd.DataFrame,
+    output_dir: str = "outputs/figures",
+    dpi: int = DEFAULT_SAVE_DPI,
+    max_workers: int = None,
+    fmt: str = "png",
+) -> None:
+    """
+    Create all visualization plots.
+
+    The figures are independent, so they are drawn in parallel worker
+    processes when more than one core is available. Each process draws
+    its plots on one reused Figure.
+
+    Args:
+        df: Firm-level analysis dataset
+        output_dir: Directory to save figures
+        dpi: Resolution of saved figures
+        max_workers: Worker processes (None uses one per core, up to one per
+            figure; 1 draws every figure in this process)
+        fmt: Image format, "png" or "svg" (faster to write, preferred for
+            report generation)
+    """
     print("=" * 60)
     print("Creating All Visualizations")
     print("=" * 60)
@@ -260,13 +743,46 @@ def create_all_plots(df: pd.DataFrame, output_dir: str = "outputs/figures") -> N
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
+    plot_funcs = [
+        plot_esg_distribution,
+        plot_correlation_heatmap,
+        plot_esg_vs_sharpe,
+        plot_esg_vs_volatility,
+        plot_sector_esg,
+        plot_pillar_comparison,
+    ]
+    if max_workers is None:
+        max_workers = min(len(plot_funcs), os.cpu_count() or 1)
+
+    # Narrow the dataset once to the columns the plots read, so every plot
+    # slices (and every worker receives) only those
+    used_cols = set(heatmap_columns(df.columns)).union(PLOT_COLUMNS)
+    df = df[[c for c in df.columns if c in used_cols or c.startswith("Sector_")]]
+
     # Generate all plots
-    plot_esg_distribution(df, output_dir)
-    plot_correlation_heatmap(df, output_dir)
-    plot_esg_vs_sharpe(df, output_dir)
-    plot_esg_vs_volatility(df, output_dir)
-    plot_sector_esg(df, output_dir)
-    plot_pillar_comparison(df, output_dir)
+    if max_workers <= 1:
+        # Draw on a Figure attached to an Agg canvas directly, so the
+        # caller's pyplot backend and rcParams are left untouched
+        with plt.rc_context(PLOT_RC_PARAMS):
+            fig = Figure()
+            FigureCanvasAgg(fig)
+            for plot_func in plot_funcs:
+                plot_func(df, output_dir, dpi, fig, fmt)
+    else:
+        # The DataFrame is sent to each worker once, through the initializer,
+        # rather than pickled again for every figure
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_plot_worker,
+            initargs=(df,),
+        ) as executor:
+            futures = [
+                executor.submit(run_plot_worker, plot_func, output_dir, dpi, fmt)
+                for plot_func in plot_funcs
+            ]
+            for future in futures:
+                future.result()
 
     print("\n[OK] All visualizations created!")
     print(f"Saved to: {output_dir}")